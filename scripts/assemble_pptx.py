@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+session.yaml 기반 PPTX 조립 스크립트 (generate_pptx.js 대체)
+
+slides/의 HTML을 여러 Node 워커(html2pptx_slides.js)로 나누어 동시에 변환하고,
+변환이 끝난 슬라이드부터 순서대로 최종 .pptx에 바로 기록한다.
+테마 이미지·로고 등 반복되는 미디어는 내용 해시로 중복 제거하여 ppt/media에 한 번만 저장한다.
+
+사용법:
+    python scripts/assemble_pptx.py <session_dir> [--output PATH] [--workers N] [--chunk-size N]
+
+예시:
+    python scripts/assemble_pptx.py working/session-20260116-150546 --workers 4
+"""
+
+import sys
+import os
+import json
+import math
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from batch_render import slide_filename
+from pptx_package import PackageWriter, slide_part_names
+from stage_timer import stage
+
+SLIDES_SCRIPT = Path(__file__).resolve().parent / "html2pptx_slides.js"
+MAX_CHUNK_SIZE = 8
+
+
+def session_html_files(session_dir: Path, session: dict) -> list:
+    """session.yaml 슬라이드 순서대로 slides/의 HTML 경로 목록"""
+    slides_dir = session_dir / "slides"
+    files = []
+    for slide in session.get("slides", []):
+        path = slides_dir / slide_filename(slide)
+        if path.exists():
+            files.append(path)
+        else:
+            print(f"[SKIP] Slide {slide['slide_number']}: HTML 파일 없음 ({path.name})")
+    return files
+
+
+def deck_metadata(session: dict) -> dict:
+    """pptx 문서 속성 (제목: 첫 슬라이드 제목, 주제: settings.purpose)"""
+    slides = session.get("slides", [])
+    settings = session.get("settings", {})
+    meta = {
+        "title": slides[0].get("title", "") if slides else "",
+        "subject": settings.get("purpose", ""),
+        "author": settings.get("author", ""),
+    }
+    return {k: v for k, v in meta.items() if v}
+
+
+def _convert_chunk(html_files: list, work_dir: str, meta: dict) -> dict:
+    """Node 워커 1개로 HTML 묶음을 슬라이드 1장짜리 pptx들로 변환. html 경로 -> 결과 dict"""
+    cmd = ["node", str(SLIDES_SCRIPT)]
+    cmd += [f"--{key}={value}" for key, value in meta.items()]
+    cmd += [work_dir] + [str(p) for p in html_files]
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+
+    results = {}
+    for line in proc.stdout.splitlines():
+        if not line.startswith("{"):
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if "html" in record:
+            results[record["html"]] = record
+    for path in html_files:
+        results.setdefault(str(path), {"html": str(path),
+                                       "error": proc.stderr.strip() or f"exit code {proc.returncode}"})
+    return results
+
+
+def assemble(html_files: list, output_path: str, workers: int = None,
+             chunk_size: int = None, meta: dict = None) -> dict:
+    """
+    HTML 슬라이드를 동시에 변환하고 순서대로 output_path에 병합.
+
+    변환 중인 묶음 수를 workers * 2로 제한하므로 임시 파일과 메모리 사용량이 일정하다.
+    반환: {"slides": 성공 수, "failed": [(html, error)], "elapsed": 초}
+    """
+    start = time.perf_counter()
+    workers = max(1, workers or min(4, os.cpu_count() or 1))
+    chunk_size = chunk_size or max(1, min(MAX_CHUNK_SIZE, math.ceil(len(html_files) / workers)))
+    chunks = [html_files[i:i + chunk_size] for i in range(0, len(html_files), chunk_size)]
+    failed = []
+    writer = None
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="assemble-pptx-")
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            remaining = iter(chunks)
+
+            def fill():
+                while len(pending) < workers * 2:
+                    chunk = next(remaining, None)
+                    if chunk is None:
+                        return
+                    chunk_dir = tempfile.mkdtemp(dir=work_dir)
+                    pending.append((chunk, chunk_dir, pool.submit(_convert_chunk, chunk, chunk_dir, meta or {})))
+
+            fill()
+            while pending:
+                chunk, chunk_dir, future = pending.popleft()
+                with stage("html2pptx_wait"):
+                    results = future.result()
+                for html in chunk:
+                    record = results[str(html)]
+                    if "error" in record:
+                        print(f"[ERROR] {Path(html).name}: {record['error']}")
+                        failed.append((str(html), record["error"]))
+                        continue
+                    with stage("package_write"), zipfile.ZipFile(record["pptx"]) as src:
+                        if writer is None:
+                            writer = PackageWriter(output_path, record["pptx"])
+                        for part in slide_part_names(src):
+                            writer.add_slide(src, part)
+                    print(f"[OK] {Path(html).name}")
+                shutil.rmtree(chunk_dir, ignore_errors=True)
+                fill()
+
+        if writer is not None:
+            with stage("package_write"):
+                writer.close()
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {"slides": writer.slide_count if writer else 0, "failed": failed,
+            "elapsed": time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="session.yaml 기반 PPTX 병렬 조립")
+    parser.add_argument("session_dir", help="session.yaml과 slides/가 있는 세션 디렉토리")
+    parser.add_argument("--output", default=None, help="출력 경로 (기본: <session_dir>/output/presentation.pptx)")
+    parser.add_argument("--workers", type=int, default=None, help="동시 Node 워커 수 (기본: min(4, CPU 수))")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help=f"워커 1개가 한 번에 변환할 슬라이드 수 (기본: 자동, 최대 {MAX_CHUNK_SIZE})")
+    args = parser.parse_args()
+
+    session_dir = Path(args.session_dir)
+    if not (session_dir / "session.yaml").exists():
+        print(f"오류: session.yaml이 존재하지 않습니다: {session_dir}")
+        sys.exit(1)
+
+    with open(session_dir / "session.yaml", "r", encoding="utf-8") as f:
+        session = yaml.safe_load(f)
+
+    output_path = args.output or str(session_dir / "output" / "presentation.pptx")
+    html_files = session_html_files(session_dir, session)
+    print(f"Found {len(html_files)} slides to process")
+
+    report = assemble(html_files, output_path, args.workers, args.chunk_size, deck_metadata(session))
+    if not report["slides"]:
+        print("오류: 변환된 슬라이드가 없습니다")
+        sys.exit(1)
+
+    print(f"\nCreated: {output_path} ({report['slides']} slides, "
+          f"{len(report['failed'])} failed, {report['elapsed']:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
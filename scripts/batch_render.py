@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+session.yaml 슬라이드 일괄(병렬) 렌더링 엔진
+
+session.yaml의 슬라이드를 프로세스 풀에 분산하여 html_renderer.render_template으로
+렌더링한다. 템플릿 경로는 registry.yaml에서 한 번만 해석하고, 각 워커는
+html_renderer를 한 번만 import한 뒤 여러 슬라이드를 처리한다.
+슬라이드 단위로 오류를 격리하며, 결과는 항상 슬라이드 번호 순으로 반환한다.
+
+사용법:
+    python scripts/batch_render.py <session_dir> [--workers N] [--theme THEME_ID] [--incremental]
+
+예시:
+    python scripts/batch_render.py working/session-20260116-150546 --workers 4
+"""
+
+import sys
+import os
+import time
+import argparse
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import yaml
+
+from render_manifest import RenderManifest
+from stage_timer import stage, record
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = PROJECT_ROOT / "templates"
+REGISTRY_PATH = TEMPLATES_DIR / "contents" / "registry.yaml"
+RENDERER_DIR = PROJECT_ROOT / ".claude" / "skills" / "ppt-gen" / "scripts"
+DEFAULT_THEME = "deep-green"
+
+
+@dataclass
+class SlideJob:
+    """렌더링할 슬라이드 1장"""
+    slide_number: int
+    template_id: str
+    template_path: str
+    content: dict
+    output_path: str
+    filename: str
+
+
+@dataclass
+class SlideResult:
+    """슬라이드 1장의 렌더링 결과 (status: ok / skip / error)"""
+    slide_number: int
+    filename: str
+    status: str
+    message: str = ""
+    elapsed: float = 0.0
+    template_id: str = ""
+
+
+@dataclass
+class BatchReport:
+    """일괄 렌더링 결과 요약"""
+    results: list = field(default_factory=list)
+    wall_time: float = 0.0
+    workers: int = 1
+    unchanged: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+
+    @property
+    def success_count(self) -> int:
+        return sum(1 for r in self.results if r.status == "ok")
+
+    @property
+    def fail_count(self) -> int:
+        return sum(1 for r in self.results if r.status != "ok")
+
+    def print_summary(self):
+        render_time = sum(r.elapsed for r in self.results)
+        print(f"\nCompleted: {self.success_count} success, {self.fail_count} failed")
+        print(f"Workers: {self.workers}, wall time: {self.wall_time:.2f}s, "
+              f"total render time: {render_time:.2f}s")
+        if self.wall_time > 0 and render_time > 0:
+            print(f"Speedup vs serial: x{render_time / self.wall_time:.1f}")
+        if self.unchanged:
+            print(f"Unchanged (skipped): {len(self.unchanged)} slides "
+                  f"{', '.join(str(n) for n in self.unchanged)}")
+        for path in self.removed:
+            print(f"  removed orphan: {Path(path).name}")
+        slowest = sorted((r for r in self.results if r.status == "ok"),
+                         key=lambda r: r.elapsed, reverse=True)[:3]
+        for r in slowest:
+            print(f"  slowest: slide {r.slide_number} ({r.template_id}) {r.elapsed * 1000:.0f}ms")
+
+
+def slide_filename(slide: dict) -> str:
+    """슬라이드 번호와 제목으로 출력 HTML 파일명 생성"""
+    slide_title = slide.get("title", "untitled")
+    safe_title = slide_title.lower().replace(" ", "_").replace("/", "_")
+    return f"slide_{slide['slide_number']:02d}_{safe_title}.html"
+
+
+def load_template_paths(registry_path: Path = REGISTRY_PATH) -> dict:
+    """registry.yaml에서 템플릿 id -> template.html 절대 경로 매핑 생성"""
+    with open(registry_path, "r", encoding="utf-8") as f:
+        registry = yaml.safe_load(f)
+
+    paths = {}
+    for entry in registry.get("templates", []):
+        paths[entry["id"]] = str(TEMPLATES_DIR / entry["path"] / "template.html")
+    return paths
+
+
+def build_jobs(session: dict, slides_dir: Path, template_paths: dict):
+    """session.yaml 슬라이드 목록을 SlideJob 목록과 사전 실패 결과로 분리"""
+    jobs = []
+    skipped = []
+
+    for slide in session.get("slides", []):
+        slide_num = slide["slide_number"]
+        template_id = slide["template"]["id"]
+        filename = slide_filename(slide)
+
+        if template_id not in template_paths:
+            skipped.append(SlideResult(slide_num, filename, "skip",
+                                       f"Template '{template_id}' not found in mapping",
+                                       template_id=template_id))
+            continue
+
+        template_path = Path(template_paths[template_id])
+        if not template_path.exists():
+            skipped.append(SlideResult(slide_num, filename, "skip",
+                                       f"Template file not found: {template_path}",
+                                       template_id=template_id))
+            continue
+
+        jobs.append(SlideJob(
+            slide_number=slide_num,
+            template_id=template_id,
+            template_path=str(template_path),
+            content=slide.get("content", {}),
+            output_path=str(slides_dir / filename),
+            filename=filename,
+        ))
+
+    return jobs, skipped
+
+
+# ---------------------------------------------------------------------------
+# 워커 프로세스
+# ---------------------------------------------------------------------------
+
+_render_template = None
+_init_error = None
+
+
+def _init_worker(renderer_dir: str):
+    """
+    워커당 한 번만 html_renderer를 import.
+
+    import 실패는 올리지 않고 기록해 두어 각 슬라이드가 실제 원인을 담은 error 결과가 되게 한다.
+    (initializer가 예외를 올리면 풀 전체가 "terminated abruptly"로 깨지고, 단일 워커에서는 실행이 중단된다)
+    """
+    global _render_template, _init_error
+    _render_template, _init_error = None, None
+    if renderer_dir not in sys.path:
+        sys.path.insert(0, renderer_dir)
+    try:
+        from html_renderer import render_template
+    except Exception as e:
+        _init_error = f"html_renderer import 실패: {type(e).__name__}: {e}"
+        return
+    _render_template = render_template
+
+
+def _render_job(job: SlideJob, theme_id: str, themes_dir: str) -> SlideResult:
+    """슬라이드 1장 렌더링. 예외는 결과로 변환하여 다른 슬라이드에 영향을 주지 않는다."""
+    start = time.perf_counter()
+    if _init_error:
+        return SlideResult(job.slide_number, job.filename, "error", _init_error, 0.0, job.template_id)
+    try:
+        _render_template(
+            job.template_path,
+            job.content,
+            theme_id=theme_id,
+            themes_dir=themes_dir,
+            output_path=job.output_path
+        )
+        status, message = "ok", ""
+    except Exception as e:
+        status, message = "error", str(e)
+    return SlideResult(job.slide_number, job.filename, status, message,
+                       time.perf_counter() - start, job.template_id)
+
+
+# ---------------------------------------------------------------------------
+# 일괄 렌더러
+# ---------------------------------------------------------------------------
+
+class BatchRenderer:
+    """
+    세션 단위 일괄 렌더러.
+
+    템플릿 경로 매핑은 생성 시 한 번만 구성하고, 같은 인스턴스로 여러 번
+    render()를 호출해도 재사용한다. template_paths로 전달한 매핑이 registry보다 우선한다.
+    """
+
+    def __init__(self, template_paths: dict = None, theme_id: str = None,
+                 themes_dir: str = None, workers: int = None,
+                 renderer_dir: str = None):
+        self.template_paths = load_template_paths()
+        for template_id, path in (template_paths or {}).items():
+            self.template_paths[template_id] = str(PROJECT_ROOT / path)
+        self.theme_id = theme_id
+        self.themes_dir = themes_dir or str(TEMPLATES_DIR / "themes")
+        self.workers = workers or os.cpu_count() or 1
+        self.renderer_dir = renderer_dir or str(RENDERER_DIR)
+
+    def render_session(self, session_dir: Path, slide_numbers=None,
+                       incremental: bool = False) -> BatchReport:
+        """
+        session_dir/session.yaml을 읽어 slides/ 아래에 렌더링.
+
+        incremental=True이면 session_dir의 매니페스트와 해시를 비교하여
+        바뀐 슬라이드만 렌더링하고, 제목 변경 등으로 남은 slide_NN_*.html을 삭제한다.
+        어느 경우든 렌더링한 슬라이드의 해시는 매니페스트에 기록한다.
+        """
+        session_dir = Path(session_dir)
+        with stage("yaml_load"), open(session_dir / "session.yaml", "r", encoding="utf-8") as f:
+            session = yaml.safe_load(f)
+        slides_dir = session_dir / "slides"
+
+        # 전체 렌더링도 매니페스트를 갱신해야 이후 증분 렌더링이 디스크의 HTML과 일치한다
+        with stage("manifest_plan"):
+            manifest = RenderManifest(session_dir)
+            plan = manifest.plan(session, slides_dir, self.template_paths,
+                                 self._theme_for(session), self.themes_dir, slide_filename)
+        to_render = plan.render if incremental else sorted(plan.digests)
+        if slide_numbers is not None:
+            to_render = [n for n in to_render if n in set(slide_numbers)]
+
+        if incremental:
+            for path in plan.orphans:
+                path.unlink()
+        report = self.render(session, slides_dir, to_render)
+        if incremental:
+            report.unchanged = plan.unchanged
+            report.removed = [str(p) for p in plan.orphans]
+
+        with stage("manifest_save"):
+            manifest.update(plan, report.results)
+            manifest.save()
+        return report
+
+    def _theme_for(self, session: dict) -> str:
+        return self.theme_id or session.get("settings", {}).get("theme", DEFAULT_THEME)
+
+    def render(self, session: dict, slides_dir: Path, slide_numbers=None) -> BatchReport:
+        """
+        세션 슬라이드 렌더링.
+
+        slide_numbers가 주어지면 해당 번호의 슬라이드만 렌더링한다.
+        """
+        slides_dir = Path(slides_dir)
+        slides_dir.mkdir(parents=True, exist_ok=True)
+        theme_id = self._theme_for(session)
+
+        jobs, results = build_jobs(session, slides_dir, self.template_paths)
+        if slide_numbers is not None:
+            wanted = set(slide_numbers)
+            jobs = [j for j in jobs if j.slide_number in wanted]
+            results = [r for r in results if r.slide_number in wanted]
+
+        workers = max(1, min(self.workers, len(jobs)))
+        start = time.perf_counter()
+
+        if workers == 1 and jobs:
+            _init_worker(self.renderer_dir)
+            results.extend(_render_job(job, theme_id, self.themes_dir) for job in jobs)
+        elif jobs:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(self.renderer_dir,)) as pool:
+                futures = {pool.submit(_render_job, job, theme_id, self.themes_dir): job
+                           for job in jobs}
+                for future in as_completed(futures):
+                    job = futures[future]
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # 워커 프로세스 자체가 죽은 경우
+                        results.append(SlideResult(job.slide_number, job.filename,
+                                                   "error", str(e),
+                                                   template_id=job.template_id))
+
+        results.sort(key=lambda r: r.slide_number)
+        elapsed = time.perf_counter() - start
+        record("template_render", elapsed)
+        # 워커에서 슬라이드별로 걸린 시간의 합 (병렬 효율 = 합 / (template_render * workers))
+        rendered = [r for r in results if r.status != "skip"]
+        record("template_render_slides", sum(r.elapsed for r in rendered), len(rendered))
+        return BatchReport(results, elapsed, workers)
+
+
+def print_results(report: BatchReport):
+    """슬라이드 번호 순으로 결과 출력"""
+    for r in report.results:
+        if r.status == "ok":
+            print(f"[OK] Slide {r.slide_number}: {r.filename}")
+        elif r.status == "skip":
+            print(f"[SKIP] Slide {r.slide_number}: {r.message}")
+        else:
+            print(f"[ERROR] Slide {r.slide_number}: {r.message}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="session.yaml 슬라이드 병렬 렌더링")
+    parser.add_argument("session_dir", help="session.yaml이 있는 세션 디렉토리")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--theme", default=None, help="테마 id (기본: session.yaml settings.theme)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="바뀐 슬라이드만 렌더링 (세션 디렉토리의 매니페스트 사용)")
+    args = parser.parse_args()
+
+    session_dir = Path(args.session_dir)
+    if not (session_dir / "session.yaml").exists():
+        print(f"오류: session.yaml이 존재하지 않습니다: {session_dir}")
+        sys.exit(1)
+
+    renderer = BatchRenderer(theme_id=args.theme, workers=args.workers)
+    report = renderer.render_session(session_dir, incremental=args.incremental)
+    print_results(report)
+    report.print_summary()
+    if report.fail_count:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
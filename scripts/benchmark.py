@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+파이프라인 벤치마크
+
+번들 세션(working/session-20260116-150546)과 ppt-sample 덱으로 전체 파이프라인을 실행하고
+단계별 시간과 RSS(단계 시작·종료 시점, 프로세스 최대값)를 JSON으로 출력한다. 저장된 기준값(baseline)과 비교하여
+느려진 단계가 있으면 종료 코드 1을 반환한다.
+
+단계 (괄호 안은 stage_timer 훅으로 기록되는 세부 시간, 결과의 substages):
+    session_load      session.yaml 로드
+    registry_index    레지스트리 역색인 빌드 + 슬라이드별 조회
+    template_rank     TF-IDF 사전 순위화 (numpy 필요)
+    render_html       HTML 렌더링 (yaml_load, template_render, template_render_slides)
+    assemble_pptx     HTML -> PPTX 조립 (html2pptx_wait, package_write)
+    ooxml_render      template.ooxml 직접 채우기 (ooxml_fill, html2pptx, package_write)
+    thumbnails        덱 썸네일 (slide_digest, pdf_convert, rasterize)
+
+실행할 수 없는 단계(의존성 없음 등, StageSkipped)는 결과의 skipped에 이유와 함께 기록하고 건너뛴다.
+그 밖의 예외나 일부 슬라이드 변환 실패는 failed에 기록하며, 실패한 단계가 있으면 종료 코드 1을 반환한다.
+
+사용법:
+    python scripts/benchmark.py [--repeat N] [--stages a,b] [--output PATH]
+                                [--baseline PATH] [--save-baseline] [--threshold 0.2]
+
+예시:
+    python scripts/benchmark.py --repeat 3 --save-baseline
+    python scripts/benchmark.py --stages ooxml_render,thumbnails
+"""
+
+import io
+import os
+import sys
+import json
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import stage_timer
+from stage_timer import stage
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+SESSION_DIR = PROJECT_ROOT / "working" / "session-20260116-150546"
+SAMPLE_DIR = PROJECT_ROOT / "ppt-sample"
+BASELINE_PATH = PROJECT_ROOT / ".benchmark_baseline.json"
+
+DEFAULT_THRESHOLD = 0.2
+# 이보다 작은 시간 차이는 측정 잡음으로 보고 회귀로 판정하지 않음 (초)
+MIN_DELTA = 0.05
+
+
+class StageSkipped(Exception):
+    """실행 환경에서 단계를 수행할 수 없음"""
+
+
+# ---------------------------------------------------------------------------
+# 단계
+# ---------------------------------------------------------------------------
+
+def _check_failed(failed: list, total: int):
+    """일부 슬라이드만 변환된 실행은 시간을 비교할 수 없으므로 단계 실패로 처리"""
+    if failed:
+        where, error = failed[0]
+        raise RuntimeError(f"{len(failed)}/{total}개 슬라이드 실패 ({where}: {str(error).splitlines()[0]})")
+
+
+def bench_session_load(work_dir: Path):
+    with open(SESSION_DIR / "session.yaml", "r", encoding="utf-8") as f:
+        yaml.safe_load(f)
+
+
+def bench_registry_index(work_dir: Path):
+    from template_index import TemplateIndex
+
+    with open(SESSION_DIR / "session.yaml", "r", encoding="utf-8") as f:
+        session = yaml.safe_load(f)
+    index = TemplateIndex.build()
+    for slide in session.get("slides", []):
+        index.query(f"{slide.get('title', '')} {slide.get('purpose', '')}",
+                    category=slide.get("template", {}).get("category"))
+
+
+def bench_template_rank(work_dir: Path):
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        raise StageSkipped("numpy 없음")
+    from template_index import TemplateIndex
+    from template_ranker import TemplateRanker
+
+    with open(SESSION_DIR / "session.yaml", "r", encoding="utf-8") as f:
+        session = yaml.safe_load(f)
+    TemplateRanker.build(TemplateIndex.build()).shortlist_session(session)
+
+
+def bench_render_html(work_dir: Path):
+    from batch_render import BatchRenderer
+
+    session_dir = work_dir / "render"
+    session_dir.mkdir()
+    shutil.copyfile(SESSION_DIR / "session.yaml", session_dir / "session.yaml")
+    report = BatchRenderer().render_session(session_dir)
+    if not report.success_count:
+        errors = [r.message for r in report.results if r.status == "error"]
+        raise StageSkipped(errors[0] if errors else "렌더링된 슬라이드 없음")
+
+
+def bench_assemble_pptx(work_dir: Path):
+    from assemble_pptx import assemble, session_html_files, deck_metadata
+
+    with open(SESSION_DIR / "session.yaml", "r", encoding="utf-8") as f:
+        session = yaml.safe_load(f)
+    report = assemble(session_html_files(SESSION_DIR, session), str(work_dir / "assembled.pptx"),
+                      meta=deck_metadata(session))
+    if not report["slides"]:
+        raise StageSkipped(report["failed"][0][1].splitlines()[0] if report["failed"] else "변환 없음")
+    _check_failed(report["failed"], report["slides"] + len(report["failed"]))
+
+
+def bench_ooxml_render(work_dir: Path):
+    from ooxml_render import render_session, load_ooxml_template
+
+    load_ooxml_template.cache_clear()
+    report = render_session(SESSION_DIR, str(work_dir / "native.pptx"))
+    if not report["native"] and not report["html"]:
+        raise StageSkipped("렌더링된 슬라이드 없음")
+    _check_failed(report["failed"], len(report["native"]) + len(report["html"]) + len(report["failed"]))
+
+
+def bench_thumbnails(work_dir: Path):
+    from pptx_package import slide_digests
+    from soffice_pool import POOL_ENV, soffice_binary
+    from generate_thumbnails import PRESETS, generate_thumbnails_with_libreoffice
+
+    # 의존성이 없을 때만 건너뛰고, 변환 중 오류는 단계 실패로 기록되게 그대로 올린다
+    try:
+        import pdf2image  # noqa: F401
+    except ImportError:
+        raise StageSkipped("pdf2image 없음")
+    if shutil.which("pdftoppm") is None:
+        raise StageSkipped("poppler(pdftoppm) 없음")
+    if not os.environ.get(POOL_ENV) and shutil.which(soffice_binary()) is None:
+        raise StageSkipped("LibreOffice(soffice) 없음")
+
+    preset = PRESETS["registry"]
+    for deck in sorted(SAMPLE_DIR.glob("*.pptx")):
+        with stage("slide_digest"):
+            slide_digests(str(deck))
+        generate_thumbnails_with_libreoffice(str(deck), str(work_dir / deck.stem),
+                                             preset["dpi"], preset["size"])
+
+
+STAGES = {
+    "session_load": bench_session_load,
+    "registry_index": bench_registry_index,
+    "template_rank": bench_template_rank,
+    "render_html": bench_render_html,
+    "assemble_pptx": bench_assemble_pptx,
+    "ooxml_render": bench_ooxml_render,
+    "thumbnails": bench_thumbnails,
+}
+
+
+# ---------------------------------------------------------------------------
+# 실행 / 비교
+# ---------------------------------------------------------------------------
+
+def run(stage_names: list, repeat: int = 1) -> dict:
+    """
+    선택한 단계를 repeat번 실행. 단계마다 stage_timer를 비우고 실행하므로 세부 시간은
+    해당 단계의 substages에 들어간다. 대표값은 실행별 시간의 중앙값.
+    """
+    stage_timer.enable()
+    runs = {}
+    skipped = {}
+    failed = {}
+
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory(prefix="pptgen-bench-") as tmp:
+            for name in stage_names:
+                if name in skipped or name in failed:
+                    continue
+                work_dir = Path(tmp) / name
+                work_dir.mkdir()
+                stage_timer.reset()
+                try:
+                    with redirect_stdout(io.StringIO()), stage(name):
+                        STAGES[name](work_dir)
+                except StageSkipped as e:
+                    skipped[name] = str(e)
+                except (Exception, SystemExit) as e:
+                    failed[name] = f"{type(e).__name__}: {e}"
+                else:
+                    runs.setdefault(name, []).append(stage_timer.report()["stages"])
+
+    stages = {}
+    for name, snapshots in runs.items():
+        if name in skipped or name in failed:
+            continue
+        seconds = [snap[name]["seconds"] for snap in snapshots]
+        substages = {}
+        for sub in snapshots[-1]:
+            if sub != name:
+                substages[sub] = {
+                    "seconds": round(statistics.median(snap.get(sub, {}).get("seconds", 0.0)
+                                                       for snap in snapshots), 4),
+                    "calls": snapshots[-1][sub]["calls"],
+                }
+        stages[name] = {
+            "seconds": round(statistics.median(seconds), 4),
+            "min": round(min(seconds), 4),
+            # 마지막 실행의 단계 진입·종료 시점 RSS
+            "rss_start_mb": snapshots[-1][name].get("rss_start_mb"),
+            "rss_end_mb": snapshots[-1][name].get("rss_end_mb"),
+            "substages": substages,
+        }
+
+    stage_timer.enable(False)
+    return {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": repeat,
+        "stages": stages,
+        "peak_rss_mb": stage_timer.peak_rss_mb(),
+        "skipped": skipped,
+        "failed": failed,
+    }
+
+
+def _flatten(stages: dict) -> dict:
+    """{단계: 초, 단계/세부: 초}"""
+    flat = {}
+    for name, entry in stages.items():
+        flat[name] = entry["seconds"]
+        for sub, sub_entry in entry.get("substages", {}).items():
+            flat[f"{name}/{sub}"] = sub_entry["seconds"]
+    return flat
+
+
+def compare(result: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    기준값 대비 회귀 목록: [(항목, 기준값, 현재값, 비율)]
+    시간은 threshold 비율 이상 느려지고 MIN_DELTA초 이상 차이 날 때, RSS는 threshold 비율 이상 늘 때 회귀.
+    """
+    regressions = []
+    current_flat = _flatten(result["stages"])
+    for name, base in _flatten(baseline.get("stages", {})).items():
+        current = current_flat.get(name)
+        if current is None or not base:
+            continue
+        ratio = current / base
+        if ratio > 1 + threshold and current - base > MIN_DELTA:
+            regressions.append((name, base, current, ratio))
+
+    base_rss = baseline.get("peak_rss_mb", {}).get("self")
+    current_rss = result["peak_rss_mb"]["self"]
+    if base_rss and current_rss and current_rss / base_rss > 1 + threshold:
+        regressions.append(("peak_rss_mb", base_rss, current_rss, current_rss / base_rss))
+    return regressions
+
+
+def print_table(result: dict, baseline: dict = None):
+    base_flat = _flatten((baseline or {}).get("stages", {}))
+    print(f"{'stage':<36}{'seconds':>10}{'baseline':>10}", file=sys.stderr)
+    for name, seconds in _flatten(result["stages"]).items():
+        label = name if "/" not in name else "  " + name.split("/", 1)[1]
+        base = base_flat.get(name)
+        base_text = f"{base:.3f}" if base is not None else "-"
+        print(f"{label:<36}{seconds:>10.3f}{base_text:>10}", file=sys.stderr)
+    for name, reason in result["skipped"].items():
+        print(f"{name:<36}{'skipped':>10}  {reason.splitlines()[0][:60]}", file=sys.stderr)
+    for name, reason in result["failed"].items():
+        print(f"{name:<36}{'FAILED':>10}  {reason.splitlines()[0][:60]}", file=sys.stderr)
+    rss = result["peak_rss_mb"]
+    print(f"\npeak RSS: self {rss['self']} MB, children {rss['children']} MB", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 벤치마크")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수 (중앙값 사용)")
+    parser.add_argument("--stages", default=None,
+                        help=f"실행할 단계 (쉼표 구분, 기본: 전체). 가능: {', '.join(STAGES)}")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: stdout)")
+    parser.add_argument("--baseline", default=str(BASELINE_PATH), help="비교할 기준 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"회귀 판정 비율 (기본: {DEFAULT_THRESHOLD} = 20%% 느려짐)")
+    args = parser.parse_args()
+
+    stage_names = args.stages.split(",") if args.stages else list(STAGES)
+    unknown = [s for s in stage_names if s not in STAGES]
+    if unknown:
+        print(f"오류: 알 수 없는 단계: {', '.join(unknown)}")
+        sys.exit(1)
+
+    result = run(stage_names, max(1, args.repeat))
+
+    baseline = None
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    result["regressions"] = [
+        {"stage": name, "baseline": base, "current": current, "ratio": round(ratio, 2)}
+        for name, base, current, ratio in (compare(result, baseline, args.threshold) if baseline else [])
+    ]
+
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    print_table(result, baseline)
+    if args.save_baseline and result["failed"]:
+        print("실패한 단계가 있어 기준값을 저장하지 않습니다", file=sys.stderr)
+    elif args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"기준값 저장: {args.baseline}", file=sys.stderr)
+
+    for r in result["regressions"]:
+        print(f"[REGRESSION] {r['stage']}: {r['baseline']} -> {r['current']} (x{r['ratio']})",
+              file=sys.stderr)
+    for name in result["failed"]:
+        print(f"[FAILED] {name}", file=sys.stderr)
+    if result["regressions"] or result["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,156 @@
 """
 PowerPoint 슬라이드 썸네일 생성 스크립트
 
+슬라이드별 콘텐츠 해시(슬라이드 XML + 참조 미디어)를 출력 디렉토리의
+.thumbnail_cache.json에 기록하고, 바뀐 슬라이드만 다시 래스터화한다.
+
 사용법:
-    python scripts/generate_thumbnails.py <input.pptx> <output_dir>
+    python scripts/generate_thumbnails.py <input.pptx> <output_dir> [--preset PRESET] [--dpi DPI]
+                                          [--workers N] [--no-cache]
 
 예시:
     python scripts/generate_thumbnails.py ppt-sample/동국시스템즈-템플릿.pptx /tmp/dongkuk-thumbnails
+    python scripts/generate_thumbnails.py ppt-sample/깔끔이-딥그린.pptx /tmp/thumbs --preset registry
+
+단계별 시간(slide_digest, pdf_convert, rasterize)은 PPTGEN_STAGE_TIMINGS 설정 시 기록된다. (stage_timer.py)
 """
 
 import sys
 import os
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from pptx_package import slide_digests
+from soffice_pool import convert_document
+from stage_timer import stage
+
+CACHE_NAME = ".thumbnail_cache.json"
+CACHE_VERSION = 1
+
+# 썸네일 크기 프리셋 (size의 None은 비율 유지)
+PRESETS = {
+    "full": {"dpi": 150, "size": None},
+    "medium": {"dpi": 96, "size": (960, None)},
+    "registry": {"dpi": 72, "size": (480, None)},
+    "small": {"dpi": 48, "size": (320, None)},
+}
+DEFAULT_PRESET = "full"
+
+
+def _render_options(preset: str, dpi: int = None) -> dict:
+    """프리셋과 DPI 지정값으로 래스터화 옵션 구성"""
+    options = dict(PRESETS[preset])
+    if dpi:
+        options["dpi"] = dpi
+    options["size"] = list(options["size"]) if options["size"] else None
+    return options
+
+
+def load_thumbnail_cache(output_dir: str) -> dict:
+    """출력 디렉토리의 썸네일 캐시 로드 (없거나 손상되면 빈 캐시)"""
+    cache_path = os.path.join(output_dir, CACHE_NAME)
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get("version") == CACHE_VERSION else {}
+
+
+def save_thumbnail_cache(output_dir: str, digests: list, options: dict):
+    cache_path = os.path.join(output_dir, CACHE_NAME)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "options": options, "slides": digests}, f, indent=2)
+    os.replace(tmp_path, cache_path)
+
+
+def stale_slides(output_dir: str, digests: list, options: dict) -> list:
+    """다시 생성해야 하는 슬라이드 인덱스(0부터) 목록"""
+    cache = load_thumbnail_cache(output_dir)
+    cached = cache.get("slides", []) if cache.get("options") == options else []
+
+    stale = []
+    for idx, digest in enumerate(digests):
+        path = os.path.join(output_dir, f"slide-{idx}.png")
+        if idx >= len(cached) or cached[idx] != digest or not os.path.exists(path):
+            stale.append(idx)
+    return stale
+
+
+def remove_extra_thumbnails(output_dir: str, slide_count: int):
+    """슬라이드 수가 줄었을 때 남은 slide-N.png 삭제"""
+    idx = slide_count
+    while os.path.exists(os.path.join(output_dir, f"slide-{idx}.png")):
+        os.remove(os.path.join(output_dir, f"slide-{idx}.png"))
+        idx += 1
+
+
+def page_ranges(pages: list, workers: int) -> list:
+    """
+    페이지 인덱스 목록을 워커별 연속 구간 [(first, last), ...]으로 분할 (0부터, last 포함).
+    """
+    runs = []
+    for page in sorted(pages):
+        if runs and page == runs[-1][1] + 1:
+            runs[-1][1] = page
+        else:
+            runs.append([page, page])
+
+    # 워커 수만큼 구간이 나오도록 긴 구간을 반으로 나눔
+    while len(runs) < workers:
+        longest = max(runs, key=lambda r: r[1] - r[0])
+        if longest[0] == longest[1]:
+            break
+        mid = (longest[0] + longest[1]) // 2
+        runs.insert(runs.index(longest) + 1, [mid + 1, longest[1]])
+        longest[1] = mid
+    return [tuple(r) for r in runs]
+
+
+def _rasterize_range(pdf_path: str, output_dir: str, first: int, last: int,
+                     dpi: int, size) -> list:
+    """PDF 페이지 구간 [first, last]를 slide-{idx}.png로 저장 (워커 프로세스에서 실행)"""
+    from pdf2image import convert_from_path
+
+    images = convert_from_path(pdf_path, dpi=dpi, first_page=first + 1, last_page=last + 1,
+                               size=tuple(size) if size else None)
+    generated = []
+    for idx, image in enumerate(images, start=first):
+        output_path = os.path.join(output_dir, f"slide-{idx}.png")
+        image.save(output_path, "PNG")
+        generated.append(output_path)
+    return generated
+
+
+def rasterize_pdf(pdf_path: str, output_dir: str, pages: list = None,
+                  dpi: int = 150, size=None, workers: int = None) -> list:
+    """PDF 페이지를 여러 프로세스에 페이지 구간 단위로 나누어 래스터화"""
+    if pages is None:
+        from pdf2image import pdfinfo_from_path
+        pages = list(range(pdfinfo_from_path(pdf_path)["Pages"]))
+    if not pages:
+        return []
+
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pages)))
+    ranges = page_ranges(pages, workers)
+    if workers == 1:
+        return [p for first, last in ranges
+                for p in _rasterize_range(pdf_path, output_dir, first, last, dpi, size)]
+
+    generated = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_rasterize_range, pdf_path, output_dir, first, last, dpi, size)
+                   for first, last in ranges]
+        for future in futures:
+            generated.extend(future.result())
+    return generated
+
+
 def generate_thumbnails_with_pptxtoimages(input_path: str, output_dir: str):
     """
     pptxtoimages 라이브러리를 사용하여 썸네일 생성
@@ -32,7 +171,8 @@ def generate_thumbnails_with_pptxtoimages(input_path: str, output_dir: str):
 
     # 썸네일 생성
     # pptxtoimages는 모든 슬라이드를 이미지로 변환
-    image_paths = pptxtoimages(input_path, output_dir)
+    with stage("pptxtoimages"):
+        image_paths = pptxtoimages(input_path, output_dir)
 
     # 생성된 이미지를 slide-{n}.png 형식으로 정리
     generated_files = []
@@ -51,14 +191,16 @@ def generate_thumbnails_with_pptxtoimages(input_path: str, output_dir: str):
     return generated_files
 
 
-def generate_thumbnails_with_libreoffice(input_path: str, output_dir: str):
+def generate_thumbnails_with_libreoffice(input_path: str, output_dir: str, dpi: int = 150,
+                                         size=None, pages: list = None, workers: int = None):
     """
     LibreOffice headless 모드를 사용하여 썸네일 생성
     (대안: pptxtoimages가 작동하지 않을 경우)
+
+    pages가 주어지면 해당 슬라이드 인덱스(0부터)만 래스터화한다.
+    PPTGEN_SOFFICE_POOL이 설정되어 있으면 soffice_pool 서버에 PDF 변환을 맡긴다.
     """
-    import subprocess
     import tempfile
-    from pdf2image import convert_from_path
 
     # 출력 디렉토리 생성
     os.makedirs(output_dir, exist_ok=True)
@@ -69,57 +211,76 @@ def generate_thumbnails_with_libreoffice(input_path: str, output_dir: str):
     # 임시 디렉토리 생성
     with tempfile.TemporaryDirectory() as tmpdir:
         # 1. PPTX를 PDF로 변환
-        pdf_path = os.path.join(tmpdir, "temp.pdf")
         print("LibreOffice로 PDF 변환 중...")
+        with stage("pdf_convert"):
+            pdf_path = convert_document(input_path, tmpdir, "pdf")
 
-        subprocess.run([
-            "libreoffice",
-            "--headless",
-            "--convert-to", "pdf",
-            "--outdir", tmpdir,
-            input_path
-        ], check=True)
-
-        # 2. PDF를 이미지로 변환
+        # 2. PDF를 이미지로 변환 (페이지 구간별 병렬)
         print("PDF를 PNG로 변환 중...")
-        images = convert_from_path(pdf_path, dpi=150)
-
-        # 3. 이미지 저장
-        generated_files = []
-        for idx, image in enumerate(images):
-            output_path = os.path.join(output_dir, f"slide-{idx}.png")
-            image.save(output_path, "PNG")
-            generated_files.append(output_path)
-            print(f"생성됨: slide-{idx}.png")
+        with stage("rasterize"):
+            generated_files = rasterize_pdf(pdf_path, output_dir, pages, dpi, size, workers)
+        for path in generated_files:
+            print(f"생성됨: {os.path.basename(path)}")
 
     print(f"\n총 {len(generated_files)}개 슬라이드 썸네일 생성 완료")
     return generated_files
 
 
 def main():
-    if len(sys.argv) < 3:
-        print("사용법: python generate_thumbnails.py <input.pptx> <output_dir>")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="PowerPoint 슬라이드 썸네일 생성")
+    parser.add_argument("input_path", help="입력 .pptx 파일")
+    parser.add_argument("output_dir", help="출력 디렉토리")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default=DEFAULT_PRESET,
+                        help=f"썸네일 크기 프리셋 (기본: {DEFAULT_PRESET})")
+    parser.add_argument("--dpi", type=int, default=None, help="래스터화 DPI (프리셋 값 대신 사용)")
+    parser.add_argument("--workers", type=int, default=None, help="래스터화 워커 프로세스 수")
+    parser.add_argument("--no-cache", action="store_true", help="캐시를 무시하고 전체 재생성")
+    args = parser.parse_args()
 
-    input_path = sys.argv[1]
-    output_dir = sys.argv[2]
+    input_path = args.input_path
+    output_dir = args.output_dir
 
     # 입력 파일 확인
     if not os.path.exists(input_path):
         print(f"오류: 입력 파일이 존재하지 않습니다: {input_path}")
         sys.exit(1)
 
+    options = _render_options(args.preset, args.dpi)
+    with stage("slide_digest"):
+        digests = slide_digests(input_path)
+    stale = list(range(len(digests))) if args.no_cache else stale_slides(output_dir, digests, options)
+
+    # 끝에서 슬라이드만 삭제된 경우에도 남은 썸네일과 캐시를 정리해야 하므로 조기 반환 전에 처리
+    os.makedirs(output_dir, exist_ok=True)
+    remove_extra_thumbnails(output_dir, len(digests))
+
+    if not stale:
+        if load_thumbnail_cache(output_dir).get("slides") != digests:
+            save_thumbnail_cache(output_dir, digests, options)
+        print(f"변경된 슬라이드 없음: {len(digests)}개 썸네일 캐시 사용")
+        return
+
+    partial = len(stale) < len(digests)
+    print(f"재생성 대상: {len(stale)}/{len(digests)}개 슬라이드")
+
+    # pptxtoimages는 전체 변환만 가능하고 DPI/크기 지정이 없으므로 기본 프리셋 전체 생성에만 사용
+    if not partial and options == _render_options(DEFAULT_PRESET):
+        try:
+            generate_thumbnails_with_pptxtoimages(input_path, output_dir)
+            save_thumbnail_cache(output_dir, digests, options)
+            return
+        except Exception as e:
+            print(f"pptxtoimages 실패: {e}")
+            print("LibreOffice 방법으로 시도 중...")
+
     try:
-        # 먼저 pptxtoimages 시도
-        generate_thumbnails_with_pptxtoimages(input_path, output_dir)
+        generate_thumbnails_with_libreoffice(input_path, output_dir, options["dpi"],
+                                             options["size"], stale, args.workers)
     except Exception as e:
-        print(f"pptxtoimages 실패: {e}")
-        print("LibreOffice 방법으로 시도 중...")
-        try:
-            generate_thumbnails_with_libreoffice(input_path, output_dir)
-        except Exception as e2:
-            print(f"LibreOffice 방법도 실패: {e2}")
-            sys.exit(1)
+        print(f"LibreOffice 방법도 실패: {e}")
+        sys.exit(1)
+
+    save_thumbnail_cache(output_dir, digests, options)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,54 @@
+/**
+ * HTML 슬라이드 -> 슬라이드 1장짜리 PPTX 변환 (assemble_pptx.py 워커)
+ *
+ * 하나의 Node 프로세스에서 여러 HTML 파일을 순서대로 변환하고,
+ * 각 파일마다 <출력폴더>/<html 파일명>.pptx를 만든다.
+ * 변환 결과는 한 줄에 하나씩 JSON으로 출력한다.
+ *
+ * 사용법:
+ *   node scripts/html2pptx_slides.js [--title=..] [--author=..] [--subject=..] <출력폴더> <slide.html> [slide.html ...]
+ */
+
+const PptxGenJS = require('pptxgenjs');
+const path = require('path');
+const fs = require('fs');
+
+const html2pptx = require(path.resolve(__dirname, '..', '.claude', 'skills', 'ppt-gen', 'scripts', 'html2pptx.js'));
+
+async function main() {
+  const args = process.argv.slice(2);
+  const meta = {};
+  for (const arg of args.filter(a => a.startsWith('--'))) {
+    const [key, ...value] = arg.slice(2).split('=');
+    meta[key] = value.join('=');
+  }
+  const [outputDir, ...htmlFiles] = args.filter(a => !a.startsWith('--'));
+
+  if (!outputDir || htmlFiles.length === 0) {
+    console.error('사용법: node html2pptx_slides.js <출력폴더> <slide.html> [slide.html ...]');
+    process.exit(1);
+  }
+
+  fs.mkdirSync(outputDir, { recursive: true });
+
+  for (const htmlPath of htmlFiles) {
+    const outputPath = path.join(outputDir, path.basename(htmlPath, '.html') + '.pptx');
+    try {
+      const pptx = new PptxGenJS();
+      pptx.layout = 'LAYOUT_16x9';
+      if (meta.title) pptx.title = meta.title;
+      if (meta.author) pptx.author = meta.author;
+      if (meta.subject) pptx.subject = meta.subject;
+      await html2pptx(htmlPath, pptx);
+      await pptx.writeFile({ fileName: outputPath });
+      console.log(JSON.stringify({ html: htmlPath, pptx: outputPath }));
+    } catch (error) {
+      console.log(JSON.stringify({ html: htmlPath, error: error.message }));
+    }
+  }
+}
+
+main().catch(error => {
+  console.error(error);
+  process.exit(1);
+});
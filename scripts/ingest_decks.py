@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+PPTX 덱 일괄 템플릿 추출 스크립트
+
+여러 덱을 vendor/ppt2html/pptxjs-cli/batch.js(브라우저 1개 공유, 임시 포트, 병렬 페이지)로
+한 번에 HTML/PNG 변환하고, 슬라이드마다 초안 템플릿 항목을 만든다.
+
+    template.ooxml/   원본 slide.xml + rels (ooxml_render.py 네이티브 경로에서 사용)
+    template.html     PPTXjs 슬라이드 HTML
+    template.yaml     출처, 캔버스, 도형 geometry(ooxml_id 포함) 초안
+    thumbnails/<category>/<id>.png
+
+모든 항목은 templates/contents 아래 임시 폴더에 먼저 만든 뒤, registry.yaml 잠금을 잡은 상태에서
+폴더 이동과 registry.yaml 갱신을 한 번에 반영한다. 도중에 실패하면 이동한 폴더를 되돌리고
+registry.yaml은 바뀌지 않는다. 이미 등록된 (원본 파일, 슬라이드)는 건너뛴다.
+
+디자인 의도·키워드·use_for 분류는 content-slide-extractor 에이전트가 초안(status: draft)을 보고 채운다.
+
+사용법:
+    python scripts/ingest_decks.py <pptx|폴더> [...] [--category CAT] [--prefix PREFIX]
+                                   [--concurrency N] [--pages N]
+
+예시:
+    python scripts/ingest_decks.py ppt-sample --concurrency 2
+"""
+
+import re
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import hashlib
+import zipfile
+import argparse
+import tempfile
+import subprocess
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from template_index import PROJECT_ROOT, TEMPLATES_DIR, REGISTRY_PATH
+from pptx_package import NS, slide_part_names, rels_path
+
+BATCH_SCRIPT = PROJECT_ROOT / "vendor" / "ppt2html" / "pptxjs-cli" / "batch.js"
+CONTENTS_DIR = TEMPLATES_DIR / "contents"
+LOCK_PATH = CONTENTS_DIR / ".registry.lock"
+DEFAULT_CATEGORY = "contents"
+
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+SHAPE_TYPES = {"sp": "shape", "pic": "picture", "grpSp": "group",
+               "graphicFrame": "graphic_frame", "cxnSp": "connector"}
+
+
+def collect_decks(inputs: list) -> list:
+    decks = []
+    for value in inputs:
+        path = Path(value).resolve()
+        if path.is_dir():
+            decks.extend(sorted(p for p in path.glob("*.pptx") if not p.name.startswith("~$")))
+        else:
+            decks.append(path)
+    return decks
+
+
+def deck_prefix(pptx_path: Path) -> str:
+    """템플릿 id 접두어: 파일명의 영문/숫자 부분, 없으면 'deck-<해시>'"""
+    slug = re.sub(r"[^a-z0-9]+", "-", pptx_path.stem.lower()).strip("-")
+    if slug:
+        return slug
+    return "deck-" + hashlib.sha1(pptx_path.name.encode("utf-8")).hexdigest()[:6]
+
+
+def run_batch_extract(decks: list, output_root: str, concurrency: int, pages: int) -> dict:
+    """batch.js 실행. pptx 경로 -> 결과 dict ({slides: [...]} 또는 {error})"""
+    cmd = ["node", str(BATCH_SCRIPT), output_root] + [str(d) for d in decks]
+    cmd += [f"--concurrency={concurrency}", f"--pages={pages}"]
+    proc = subprocess.run(cmd, stdout=subprocess.PIPE, text=True, encoding="utf-8")
+
+    results = {}
+    for line in proc.stdout.splitlines():
+        if line.startswith("{"):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            results[record["pptx"]] = record
+    for deck in decks:
+        results.setdefault(str(deck), {"pptx": str(deck), "error": f"batch.js exit code {proc.returncode}"})
+    return results
+
+
+# ---------------------------------------------------------------------------
+# 슬라이드 -> 초안 템플릿
+# ---------------------------------------------------------------------------
+
+def _percent(value: int, total: int) -> str:
+    return f"{value / total * 100:.1f}%"
+
+
+def _shape_geometry(element, slide_size: tuple) -> dict:
+    xfrm = element.find("p:spPr/a:xfrm", {**NS, "a": A_NS})
+    if xfrm is None:
+        xfrm = element.find("p:grpSpPr/a:xfrm", {**NS, "a": A_NS})
+    if xfrm is None:
+        xfrm = element.find("p:xfrm", NS)
+    if xfrm is None:
+        return None
+    off, ext = xfrm.find(f"{{{A_NS}}}off"), xfrm.find(f"{{{A_NS}}}ext")
+    if off is None or ext is None:
+        return None
+    width, height = slide_size
+    return {
+        "x": _percent(int(off.get("x")), width),
+        "y": _percent(int(off.get("y")), height),
+        "cx": _percent(int(ext.get("cx")), width),
+        "cy": _percent(int(ext.get("cy")), height),
+        "rotation": int(xfrm.get("rot", 0)) / 60000,
+    }
+
+
+def slide_shapes(slide_xml: bytes, slide_size: tuple) -> list:
+    """spTree 최상위 도형 -> template.yaml shapes 초안 (z_index는 문서 순서)"""
+    root = ET.fromstring(slide_xml)
+    tree = root.find("p:cSld/p:spTree", NS)
+    shapes = []
+    for z, element in enumerate(tree if tree is not None else []):
+        kind = element.tag.rsplit("}", 1)[-1]
+        if kind not in SHAPE_TYPES:
+            continue
+        c_nv_pr = element.find(".//p:cNvPr", NS)
+        geometry = _shape_geometry(element, slide_size)
+        if c_nv_pr is None or geometry is None:
+            continue
+        shape = {
+            "id": f"shape-{len(shapes) + 1}",
+            "ooxml_id": int(c_nv_pr.get("id")),
+            "name": c_nv_pr.get("name", ""),
+            "type": SHAPE_TYPES[kind],
+            "z_index": z,
+            "geometry": geometry,
+        }
+        text = "\n".join("".join(t.text or "" for t in p.iter(f"{{{A_NS}}}t"))
+                         for p in element.iter(f"{{{A_NS}}}p")).strip()
+        if kind == "sp" and element.find("p:txBody", NS) is not None:
+            shape["text"] = {"has_text": bool(text), "content": text}
+        shapes.append(shape)
+    return shapes
+
+
+def build_draft(zf: zipfile.ZipFile, slide_part: str, slide_index: int, template_id: str,
+                category: str, source: str, slide_size: tuple, html_path: str,
+                target_dir: Path, extracted_at: str) -> dict:
+    """
+    target_dir에 template.ooxml / template.html / template.yaml 작성. registry 항목 반환.
+    """
+    ooxml_dir = target_dir / "template.ooxml"
+    (ooxml_dir / "_rels").mkdir(parents=True)
+    slide_xml = zf.read(slide_part)
+    (ooxml_dir / "slide.xml").write_bytes(slide_xml)
+    if rels_path(slide_part) in zf.NameToInfo:
+        (ooxml_dir / "_rels" / "slide.xml.rels").write_bytes(zf.read(rels_path(slide_part)))
+    if html_path and os.path.exists(html_path):
+        shutil.copyfile(html_path, target_dir / "template.html")
+
+    width, height = slide_size
+    ratio = math.gcd(width, height)
+    name = f"{Path(source).stem} {slide_index}번 슬라이드"
+    template = {
+        "content_template": {
+            "id": template_id,
+            "name": name,
+            "version": "1.0",
+            "source": source,
+            "source_slide_index": slide_index - 1,
+            "extracted_at": extracted_at,
+            "status": "draft",
+        },
+        "canvas": {
+            "reference_width": 1920,
+            "reference_height": round(1920 * height / width),
+            "aspect_ratio": f"{width // ratio}:{height // ratio}",
+        },
+        "shapes": slide_shapes(slide_xml, slide_size),
+        "thumbnail": f"thumbnails/{category}/{template_id}.png",
+    }
+    header = (f"# {name} (초안)\n# 원본: {source}:{slide_index}\n"
+              f"# 추출일: {extracted_at[:10]}\n\n")
+    with open(target_dir / "template.yaml", "w", encoding="utf-8") as f:
+        f.write(header)
+        yaml.safe_dump(template, f, allow_unicode=True, sort_keys=False, default_flow_style=False)
+
+    return {
+        "id": template_id,
+        "category": category,
+        "name": name,
+        "path": f"contents/{category}/{template_id}",
+        "thumbnail": f"contents/thumbnails/{category}/{template_id}.png",
+        "status": "draft",
+        "has_ooxml": True,
+        "render_method": "ooxml",
+        "source": source,
+    }
+
+
+def _unique_id(base: str, taken: set) -> str:
+    """taken에 없는 id (base, base-2, base-3, ...)"""
+    template_id, suffix = base, 2
+    while template_id in taken:
+        template_id = f"{base}-{suffix}"
+        suffix += 1
+    return template_id
+
+
+def _reassign_id(entry: dict, template_dir: Path, new_id: str):
+    """staging에 만든 초안 항목의 id를 바꾸고 template.yaml의 id·썸네일 경로도 맞춘다"""
+    category = entry["category"]
+    entry.update({
+        "id": new_id,
+        "path": f"contents/{category}/{new_id}",
+        "thumbnail": f"contents/thumbnails/{category}/{new_id}.png",
+    })
+    yaml_path = template_dir / "template.yaml"
+    text = yaml_path.read_text(encoding="utf-8")
+    header = "".join(line for line in text.splitlines(keepends=True) if line.startswith("#"))
+    template = yaml.safe_load(text)
+    template["content_template"]["id"] = new_id
+    template["thumbnail"] = f"thumbnails/{category}/{new_id}.png"
+    with open(yaml_path, "w", encoding="utf-8") as f:
+        f.write(header + "\n")
+        yaml.safe_dump(template, f, allow_unicode=True, sort_keys=False, default_flow_style=False)
+
+
+def stage_deck(record: dict, staging: Path, category: str, prefix: str, taken: set,
+               registered: set) -> list:
+    """
+    덱 1개의 초안 템플릿을 staging 아래 만들고
+    [(registry 항목, 폴더, 썸네일, (원본 파일, 슬라이드 번호))] 반환
+    """
+    pptx_path = Path(record["pptx"])
+    try:
+        source = pptx_path.relative_to(PROJECT_ROOT).as_posix()
+    except ValueError:
+        source = str(pptx_path)
+    html_by_index = {s["index"]: s for s in record.get("slides", [])}
+    extracted_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    staged = []
+    with zipfile.ZipFile(pptx_path) as zf:
+        m = re.search(rb'<p:sldSz cx="(\d+)" cy="(\d+)"', zf.read("ppt/presentation.xml"))
+        slide_size = (int(m.group(1)), int(m.group(2))) if m else (12192000, 6858000)
+        for index, part in enumerate(slide_part_names(zf), start=1):
+            if (source, index) in registered:
+                continue
+            template_id = _unique_id(f"{prefix}-{index:02d}", taken)
+            taken.add(template_id)
+
+            slide = html_by_index.get(index, {})
+            target_dir = staging / category / template_id
+            entry = build_draft(zf, part, index, template_id, category, source, slide_size,
+                                slide.get("html"), target_dir, extracted_at)
+            thumbnail = slide.get("png") if slide.get("png") and os.path.exists(slide["png"]) else None
+            staged.append((entry, target_dir, thumbnail, (source, index)))
+    return staged
+
+
+# ---------------------------------------------------------------------------
+# registry 트랜잭션
+# ---------------------------------------------------------------------------
+
+@contextmanager
+def registry_lock(lock_path: Path = LOCK_PATH):
+    """
+    여러 추출 프로세스가 동시에 registry.yaml을 갱신하지 않도록 배타 잠금.
+    (Windows는 fcntl 대신 msvcrt로 잠금 파일의 첫 바이트를 잠근다)
+    """
+    with open(lock_path, "w") as lock:
+        if fcntl is None:
+            while True:
+                try:
+                    msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue  # LK_LOCK은 약 10초 재시도 후 실패하므로 계속 대기
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _registered_sources(registry: dict) -> set:
+    """
+    이미 등록된 (원본 파일, 슬라이드 번호).
+
+    registry 항목의 source는 대부분 문자열(원본 파일)이고 슬라이드 위치는 template.yaml의
+    content_template.source_slide_index(0부터)에 있다. 예전 형식인 {file, slide} dict도 인식한다.
+    """
+    sources = set()
+    for entry in registry.get("templates", []):
+        source = entry.get("source")
+        if isinstance(source, dict) and source.get("slide") is not None:
+            sources.add((source.get("file"), int(source["slide"])))
+        elif isinstance(source, str) and entry.get("path"):
+            try:
+                with open(TEMPLATES_DIR / entry["path"] / "template.yaml", "r", encoding="utf-8") as f:
+                    template = yaml.safe_load(f) or {}
+            except (OSError, yaml.YAMLError):
+                continue
+            index = (template.get("content_template") or {}).get("source_slide_index")
+            if isinstance(index, int):
+                sources.add((source, index + 1))
+    return sources
+
+
+def _registry_text(registry_text: str, registry: dict, entries: list) -> str:
+    """
+    registry.yaml 본문(주석 포함)은 그대로 두고 요약 필드를 갱신한 뒤 새 항목을 뒤에 붙인다.
+    """
+    templates = registry.get("templates", []) + entries
+    categories = dict(registry.get("categories") or {})
+    for entry in entries:
+        categories[entry["category"]] = categories.get(entry["category"], 0) + 1
+    header = {
+        "version": registry.get("version", "2.0"),
+        "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "total": len(templates),
+        "categories": dict(sorted(categories.items())),
+    }
+    dump = lambda value: yaml.safe_dump(value, allow_unicode=True, sort_keys=False,
+                                        default_flow_style=False)
+
+    body_start = registry_text.find("\ntemplates:")
+    body = registry_text[body_start + 1:] if body_start >= 0 else "templates:\n"
+    if not body.endswith("\n"):
+        body += "\n"
+    if entries:
+        body += dump(entries)
+    return dump(header) + body
+
+
+def commit_entries(staged: list, staging: Path, registry_path: Path = REGISTRY_PATH) -> list:
+    """
+    staging의 템플릿 폴더·썸네일을 제자리로 옮기고 registry.yaml을 한 번에 갱신.
+    실패하면 옮긴 파일을 되돌린다. 등록된 항목 목록 반환.
+    """
+    with registry_lock():
+        registry_text = registry_path.read_text(encoding="utf-8")
+        registry = yaml.safe_load(registry_text) or {}
+        registered = _registered_sources(registry)
+        ids = {e["id"] for e in registry.get("templates", [])}
+
+        # 잠금을 기다리는 동안 다른 프로세스가 등록한 슬라이드는 제외하고, 선점된 id는 새로 붙인다
+        pending = []
+        for entry, template_dir, thumbnail, key in staged:
+            if key in registered:
+                print(f"[SKIP] {key[0]}:{key[1]} 이미 등록됨")
+                continue
+            if entry["id"] in ids:
+                old_id = entry["id"]
+                _reassign_id(entry, template_dir, _unique_id(old_id, ids))
+                print(f"[INFO] id 변경: {old_id} -> {entry['id']} (다른 프로세스가 먼저 등록)")
+            ids.add(entry["id"])
+            pending.append((entry, template_dir, thumbnail, key))
+        staged = pending
+        if not staged:
+            # 추가할 항목이 없으면 registry.yaml을 건드리지 않는다 (mtime이 바뀌면 인덱스가 재빌드됨)
+            shutil.rmtree(staging, ignore_errors=True)
+            return []
+        moved = []
+        try:
+            for entry, template_dir, thumbnail, _ in staged:
+                final_dir = TEMPLATES_DIR / entry["path"]
+                final_dir.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(template_dir, final_dir)
+                moved.append(final_dir)
+                if thumbnail:
+                    final_thumb = TEMPLATES_DIR / entry["thumbnail"]
+                    final_thumb.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copyfile(thumbnail, final_thumb)
+                    moved.append(final_thumb)
+
+            entries = [e for e, _, _, _ in staged]
+            tmp_path = registry_path.with_name(registry_path.name + ".tmp")
+            tmp_path.write_text(_registry_text(registry_text, registry, entries), encoding="utf-8")
+            tmp_path.replace(registry_path)
+        except BaseException:
+            for path in reversed(moved):
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+            raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return entries
+
+
+def ingest(decks: list, category: str = DEFAULT_CATEGORY, prefix: str = None,
+           concurrency: int = 2, pages: int = 4) -> dict:
+    """
+    덱 목록을 추출하여 registry에 등록.
+    반환: {"added": [registry 항목], "failed": [(pptx, error)], "elapsed": 초}
+    """
+    start = time.perf_counter()
+    with open(REGISTRY_PATH, "r", encoding="utf-8") as f:
+        registry = yaml.safe_load(f) or {}
+    registered = _registered_sources(registry)
+    taken = {e["id"] for e in registry.get("templates", [])}
+
+    failed = []
+    staging = Path(tempfile.mkdtemp(prefix=".ingest-", dir=CONTENTS_DIR))
+    try:
+        with tempfile.TemporaryDirectory(prefix="ingest-html-") as html_root:
+            results = run_batch_extract(decks, html_root, concurrency, pages)
+            staged = []
+            for deck in decks:
+                record = results[str(deck)]
+                if "error" in record:
+                    failed.append((str(deck), record["error"]))
+                    continue
+                staged += stage_deck(record, staging, category, prefix or deck_prefix(deck),
+                                     taken, registered)
+            added = commit_entries(staged, staging, REGISTRY_PATH)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    return {"added": added, "failed": failed, "elapsed": time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PPTX 덱 일괄 템플릿 추출")
+    parser.add_argument("inputs", nargs="+", help="pptx 파일 또는 pptx가 있는 폴더")
+    parser.add_argument("--category", default=DEFAULT_CATEGORY,
+                        help=f"초안 템플릿 카테고리 (기본: {DEFAULT_CATEGORY})")
+    parser.add_argument("--prefix", default=None, help="템플릿 id 접두어 (기본: 파일명에서 생성)")
+    parser.add_argument("--concurrency", type=int, default=2, help="동시에 변환할 덱 수")
+    parser.add_argument("--pages", type=int, default=4, help="덱마다 PNG 캡처에 쓸 브라우저 페이지 수")
+    args = parser.parse_args()
+
+    decks = collect_decks(args.inputs)
+    missing = [d for d in decks if not d.exists()]
+    if missing or not decks:
+        print(f"오류: pptx 파일을 찾을 수 없습니다: {', '.join(map(str, missing or args.inputs))}")
+        sys.exit(1)
+
+    report = ingest(decks, args.category, args.prefix, args.concurrency, args.pages)
+    for pptx, error in report["failed"]:
+        print(f"[ERROR] {Path(pptx).name}: {error}")
+    for entry in report["added"]:
+        print(f"[OK] {entry['id']} <- {entry['source']} ({entry['name']})")
+    print(f"\n{len(report['added'])}개 템플릿 등록, {len(report['failed'])}개 덱 실패 "
+          f"({report['elapsed']:.1f}s)")
+    if report["failed"] and not report["added"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+template.ooxml 직접 채우기 (브라우저 없는 네이티브 렌더링)
+
+각 템플릿의 template.ooxml/slide.xml에 session.yaml content를 바로 채워 넣고,
+zipfile 수준에서 최종 .pptx에 기록한다. HTML -> 헤드리스 브라우저 -> html2pptx 경로는
+OOXML이 없거나(has_ooxml: false) 채울 수 없는 템플릿에만 사용한다.
+
+template.yaml 도형 -> slide.xml 도형 연결:
+    template.yaml shapes[]의 geometry(x, y %)와 slide.xml <a:off>를 비교하여
+    같은 위치의 텍스트 도형을 찾는다. (shapes[].ooxml_id가 있으면 그 cNvPr id를 그대로 사용)
+
+도형 -> content 값 연결 (먼저 일치하는 규칙 사용):
+    1. placeholders[]의 shape_id          -> content[name]
+    2. 도형 name ('title-text')            -> content['title']
+    3. 도형 id ('shape-title-2', 'label-2') -> content['items'][1]['title' / 'label']
+
+content의 모든 텍스트 값이 도형에 연결될 때만 네이티브로 렌더링하고, 아니면 HTML 경로로 보낸다.
+
+사용법:
+    python scripts/ooxml_render.py <session_dir> [--output PATH] [--workers N] [--html-only]
+
+예시:
+    python scripts/ooxml_render.py working/session-20260116-150546
+"""
+
+import re
+import sys
+import time
+import shutil
+import zipfile
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from template_index import TemplateIndex, TEMPLATES_DIR, PROJECT_ROOT
+from batch_render import slide_filename
+from assemble_pptx import _convert_chunk, deck_metadata
+from pptx_package import PackageWriter, slide_part_names, read_rels, scale_slide_xml, REL_LAYOUT
+from stage_timer import stage
+
+# 원본 덱 크기를 알 수 없을 때 사용하는 16:9 슬라이드 크기 (EMU)
+DEFAULT_SLIDE_SIZE = (12192000, 6858000)
+# 원본 덱 헤더의 안내 문구 -> session.yaml 슬라이드 필드 (없으면 빈 문자열로 지움)
+HEADER_PROMPTS = {
+    "제목을 입력해 주세요.": "title",
+    "간략한 설명을 적어주세요.": "subtitle",
+}
+# 위치 비교 허용 오차 (슬라이드 크기 대비 %)
+GEOMETRY_TOLERANCE = 1.5
+
+_SP_RE = re.compile(r"<p:sp>.*?</p:sp>", re.S)
+_CNVPR_RE = re.compile(r'<p:cNvPr id="(\d+)"')
+_XFRM_RE = re.compile(r'<a:off x="(-?\d+)" y="(-?\d+)"/>\s*<a:ext cx="(\d+)" cy="(\d+)"/>')
+_TEXT_RE = re.compile(r"<a:t>([^<]*)</a:t>")
+_TXBODY_RE = re.compile(r"(<p:txBody>)(.*?)(</p:txBody>)", re.S)
+_PARA_RE = re.compile(r"<a:p>.*?</a:p>|<a:p/>", re.S)
+_PPR_RE = re.compile(r"<a:pPr\b[^>]*/>|<a:pPr\b[^>]*>.*?</a:pPr>", re.S)
+_RPR_RE = re.compile(r"<a:rPr\b[^>]*/>|<a:rPr\b[^>]*>.*?</a:rPr>", re.S)
+_ENDRPR_RE = re.compile(r"<a:endParaRPr\b[^>]*/>|<a:endParaRPr\b[^>]*>.*?</a:endParaRPr>", re.S)
+
+
+class DirectoryPackage:
+    """
+    template.ooxml 디렉토리를 ppt/slides/slide.xml 하나만 있는 패키지처럼 읽는다.
+    (PackageWriter.add_slide_xml의 src로 사용)
+
+    slide.xml rels가 참조하는 이미지·차트 등은 template.ooxml에 함께 저장되지 않으므로
+    템플릿을 추출한 원본 덱(source_deck)의 같은 파트를 읽는다.
+    """
+
+    SLIDE_PART = "ppt/slides/slide.xml"
+
+    def __init__(self, ooxml_dir: Path, source_deck: Path = None):
+        self._files = {
+            self.SLIDE_PART: Path(ooxml_dir) / "slide.xml",
+            "ppt/slides/_rels/slide.xml.rels": Path(ooxml_dir) / "_rels" / "slide.xml.rels",
+        }
+        self._files = {name: path for name, path in self._files.items() if path.exists()}
+        self._source = None
+        if source_deck and Path(source_deck).exists():
+            try:
+                self._source = zipfile.ZipFile(source_deck)
+            except zipfile.BadZipFile:
+                self._source = None
+        self.NameToInfo = dict(self._source.NameToInfo) if self._source else {}
+        self.NameToInfo.update(self._files)
+
+    def read(self, name: str) -> bytes:
+        if name in self._files:
+            return self._files[name].read_bytes()
+        return self._source.read(name)
+
+
+@dataclass
+class OoxmlTemplate:
+    """채우기 준비가 끝난 template.ooxml"""
+    template_id: str
+    package: DirectoryPackage
+    slide_xml: str
+    bindings: list = field(default_factory=list)  # [(cNvPr id, content 경로 tuple)]
+    slide_size: tuple = DEFAULT_SLIDE_SIZE
+    source_deck: str = None
+
+
+# ---------------------------------------------------------------------------
+# 템플릿 로드 / 도형 연결
+# ---------------------------------------------------------------------------
+
+def _percent(value) -> float:
+    return float(str(value).rstrip("%"))
+
+
+def _deck_slide_size(deck_path: Path) -> tuple:
+    try:
+        with zipfile.ZipFile(deck_path) as zf:
+            m = re.search(rb'<p:sldSz cx="(\d+)" cy="(\d+)"', zf.read("ppt/presentation.xml"))
+        if m:
+            return int(m.group(1)), int(m.group(2))
+    except (OSError, KeyError, zipfile.BadZipFile):
+        pass
+    return DEFAULT_SLIDE_SIZE
+
+
+def _source_deck(template: dict) -> str:
+    source = (template.get("content_template") or {}).get("source") or template.get("source")
+    if isinstance(source, dict):
+        source = source.get("file")
+    return source if isinstance(source, str) and source.endswith(".pptx") else None
+
+
+def _text_shapes(slide_xml: str, slide_size: tuple) -> dict:
+    """slide.xml 텍스트 도형: cNvPr id -> (x, y, cx, cy) % (슬라이드 크기 대비)"""
+    width, height = slide_size
+    shapes = {}
+    for sp in _SP_RE.findall(slide_xml):
+        if "<p:txBody>" not in sp:
+            continue
+        id_match, xfrm = _CNVPR_RE.search(sp), _XFRM_RE.search(sp)
+        if not id_match or not xfrm:
+            continue
+        x, y, cx, cy = (int(v) for v in xfrm.groups())
+        shapes[id_match.group(1)] = (x / width * 100, y / height * 100,
+                                     cx / width * 100, cy / height * 100)
+    return shapes
+
+
+def _match_shape(geometry: dict, shapes: dict) -> str:
+    """
+    template.yaml geometry와 위치가 가장 가까운 slide.xml 도형 id.
+    추출 시 크기는 텍스트 영역 기준으로 보정되는 경우가 있어 위치(x, y)로 찾고 크기는 동점 구분에만 쓴다.
+    """
+    try:
+        x, y, cx, cy = (_percent(geometry[k]) for k in ("x", "y", "cx", "cy"))
+    except (KeyError, TypeError, ValueError):
+        return None
+    best, best_key = None, None
+    for shape_id, (sx, sy, scx, scy) in shapes.items():
+        offset = max(abs(x - sx), abs(y - sy))
+        if offset > GEOMETRY_TOLERANCE:
+            continue
+        key = (offset, abs(cx - scx) + abs(cy - scy))
+        if best_key is None or key < best_key:
+            best, best_key = shape_id, key
+    return best
+
+
+def _content_path(shape: dict, placeholder_names: dict) -> tuple:
+    """template.yaml 도형 -> content 경로 규칙 (모듈 docstring 참고)"""
+    if shape.get("id") in placeholder_names:
+        return (placeholder_names[shape["id"]],)
+
+    name = str(shape.get("name", ""))
+    if re.fullmatch(r"[a-z]+(?:-[a-z]+)*", name):
+        key = re.sub(r"-text$", "", name).replace("-", "_")
+        return (key,)
+
+    m = re.fullmatch(r"(?:shape-)?(?:([a-z]+(?:-[a-z]+)*)-)?(\d+)", str(shape.get("id", "")))
+    if m:
+        key = (m.group(1) or "text").replace("-", "_")
+        return ("items", int(m.group(2)) - 1, key)
+    return None
+
+
+def _resolve(content: dict, path: tuple):
+    value = content
+    for step in path:
+        if isinstance(step, int):
+            if not isinstance(value, list) or step >= len(value):
+                return None
+        elif not isinstance(value, dict) or step not in value:
+            return None
+        value = value[step]
+    if isinstance(value, list) and all(isinstance(v, (str, int, float)) for v in value):
+        return "\n".join(str(v) for v in value)
+    return None if isinstance(value, (dict, list)) else str(value)
+
+
+def _text_leaves(content: dict) -> set:
+    """content의 텍스트 값 경로 집합 (top-level 값, items[i].key)"""
+    leaves = set()
+    for key, value in content.items():
+        if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+            for i, item in enumerate(value):
+                leaves.update((key, i, k) for k, v in item.items() if not isinstance(v, (dict, list)))
+        else:
+            leaves.add((key,))
+    return leaves
+
+
+@lru_cache(maxsize=None)
+def load_ooxml_template(template_id: str) -> OoxmlTemplate:
+    """레지스트리 id로 template.ooxml 로드. 네이티브로 쓸 수 없으면 None."""
+    entry = TemplateIndex.load().get(template_id)
+    if not entry or not entry.get("has_ooxml"):
+        return None
+
+    template_dir = TEMPLATES_DIR / entry["path"]
+    with open(template_dir / "template.yaml", "r", encoding="utf-8") as f:
+        template = yaml.safe_load(f) or {}
+
+    source_deck = _source_deck(template)
+    package = DirectoryPackage(template_dir / "template.ooxml",
+                               PROJECT_ROOT / source_deck if source_deck else None)
+    if DirectoryPackage.SLIDE_PART not in package.NameToInfo:
+        return None
+
+    # 원본 덱에서도 찾을 수 없는 파트를 참조하면 네이티브 불가
+    if any(not external and rtype != REL_LAYOUT and target not in package.NameToInfo
+           for _, rtype, target, external in read_rels(package, DirectoryPackage.SLIDE_PART)):
+        return None
+
+    slide_size = _deck_slide_size(PROJECT_ROOT / source_deck) if source_deck else DEFAULT_SLIDE_SIZE
+    slide_xml = package.read(DirectoryPackage.SLIDE_PART).decode("utf-8")
+    shapes = _text_shapes(slide_xml, slide_size)
+
+    placeholders = template.get("placeholders")
+    placeholder_names = {p["shape_id"]: p["name"] for p in placeholders
+                         if isinstance(p, dict) and p.get("shape_id") and p.get("name")} \
+        if isinstance(placeholders, list) else {}
+
+    bindings = []
+    for shape in template.get("shapes") or []:
+        if not isinstance(shape, dict) or not shape.get("text"):
+            continue
+        shape_id = str(shape["ooxml_id"]) if shape.get("ooxml_id") else \
+            _match_shape(shape.get("geometry") or {}, shapes)
+        path = _content_path(shape, placeholder_names)
+        if shape_id and path:
+            bindings.append((shape_id, path))
+
+    if not bindings:
+        return None
+    return OoxmlTemplate(template_id, package, slide_xml, bindings, slide_size, source_deck)
+
+
+# ---------------------------------------------------------------------------
+# XML 채우기
+# ---------------------------------------------------------------------------
+
+def _xml_text(value: str) -> str:
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _replace_text(sp: str, text: str) -> str:
+    """도형 txBody의 문단을 text 줄 단위 문단으로 교체. 첫 문단/첫 run 서식을 유지한다."""
+    m = _TXBODY_RE.search(sp)
+    if not m:
+        return sp
+    body = m.group(2)
+    paragraphs = _PARA_RE.findall(body)
+    first = paragraphs[0] if paragraphs else ""
+    ppr = (_PPR_RE.search(first) or [""])[0] if first else ""
+    rpr_match = _RPR_RE.search(body)
+    rpr = rpr_match.group(0) if rpr_match else ""
+    end_rpr = (_ENDRPR_RE.search(first) or [""])[0] if first else ""
+
+    new_paragraphs = "".join(
+        f"<a:p>{ppr}<a:r>{rpr}<a:t>{_xml_text(line)}</a:t></a:r>{end_rpr}</a:p>" if line else
+        f"<a:p>{ppr}{end_rpr}</a:p>"
+        for line in text.split("\n"))
+    head = body[:body.find("<a:p")] if "<a:p" in body else body
+    return sp[:m.start(2)] + head + new_paragraphs + sp[m.end(2):]
+
+
+def fill_slide(template: OoxmlTemplate, content: dict, header: dict = None) -> bytes:
+    """
+    content를 채운 slide.xml 반환. content의 텍스트 값 중 연결되지 않은 것이 있으면 None
+    (HTML 경로로 렌더링해야 함). header(슬라이드 title/subtitle)는 HEADER_PROMPTS 도형에 채운다.
+    """
+    values = {}
+    consumed = set()
+    for shape_id, path in template.bindings:
+        value = _resolve(content, path)
+        if value is not None:
+            values[shape_id] = value
+            consumed.add(path)
+    if not values or not _text_leaves(content) <= consumed:
+        return None
+
+    def fill(match):
+        sp = match.group(0)
+        id_match = _CNVPR_RE.search(sp)
+        if id_match and id_match.group(1) in values:
+            return _replace_text(sp, values[id_match.group(1)])
+        prompt = HEADER_PROMPTS.get("".join(_TEXT_RE.findall(sp)).strip())
+        if prompt:
+            return _replace_text(sp, str((header or {}).get(prompt) or ""))
+        return sp
+
+    return _SP_RE.sub(fill, template.slide_xml).encode("utf-8")
+
+
+# ---------------------------------------------------------------------------
+# 덱 렌더링
+# ---------------------------------------------------------------------------
+
+def render_session(session_dir: Path, output_path: str = None, workers: int = None,
+                   html_only: bool = False) -> dict:
+    """
+    session.yaml 전체를 .pptx로 렌더링. 가능한 슬라이드는 template.ooxml에 직접 채우고
+    나머지는 slides/의 HTML을 html2pptx로 변환한다.
+
+    반환: {"native": [...], "html": [...], "failed": [(slide, error)], "elapsed": 초}
+    """
+    start = time.perf_counter()
+    session_dir = Path(session_dir)
+    with stage("yaml_load"), open(session_dir / "session.yaml", "r", encoding="utf-8") as f:
+        session = yaml.safe_load(f)
+    output_path = output_path or str(session_dir / "output" / "presentation.pptx")
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    plan = []  # (slide_number, "native", (template, xml)) | (slide_number, "html", path)
+    for slide in session.get("slides", []):
+        slide_xml, template = None, None
+        if not html_only:
+            with stage("ooxml_fill"):
+                template = load_ooxml_template(slide["template"]["id"])
+                if template:
+                    slide_xml = fill_slide(template, slide.get("content", {}), slide)
+        if slide_xml is not None:
+            plan.append((slide["slide_number"], "native", (template, slide_xml)))
+        else:
+            plan.append((slide["slide_number"], "html", session_dir / "slides" / slide_filename(slide)))
+
+    report = {"native": [], "html": [], "failed": [], "elapsed": 0.0}
+    work_dir = tempfile.mkdtemp(prefix="ooxml-render-")
+    try:
+        with stage("html2pptx"):
+            html_results = _convert_html(plan, work_dir, workers, deck_metadata(session), report)
+        base = next((html_results[str(p)]["pptx"] for _, kind, p in plan
+                     if kind == "html" and "pptx" in html_results.get(str(p), {})), None)
+        if base is None:
+            decks = [value[0].source_deck for _, kind, value in plan
+                     if kind == "native" and value[0].source_deck]
+            if not decks:
+                raise RuntimeError("기준 패키지로 사용할 pptx가 없습니다")
+            base = str(PROJECT_ROOT / decks[0])
+
+        with zipfile.ZipFile(base) as base_zip:
+            m = re.search(rb'<p:sldSz cx="(\d+)" cy="(\d+)"', base_zip.read("ppt/presentation.xml"))
+            base_size = (int(m.group(1)), int(m.group(2))) if m else DEFAULT_SLIDE_SIZE
+
+        with stage("package_write"), PackageWriter(output_path, base) as writer:
+            for slide_number, kind, value in plan:
+                if kind == "native":
+                    template, slide_xml = value
+                    slide_xml = scale_slide_xml(slide_xml, base_size[0] / template.slide_size[0],
+                                                base_size[1] / template.slide_size[1])
+                    writer.add_slide_xml(slide_xml, template.package, DirectoryPackage.SLIDE_PART)
+                    report["native"].append(slide_number)
+                    continue
+                record = html_results.get(str(value), {})
+                if "pptx" not in record:
+                    continue
+                with zipfile.ZipFile(record["pptx"]) as src:
+                    for part in slide_part_names(src):
+                        writer.add_slide(src, part)
+                report["html"].append(slide_number)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report["elapsed"] = time.perf_counter() - start
+    return report
+
+
+def _convert_html(plan: list, work_dir: str, workers: int, meta: dict, report: dict) -> dict:
+    """HTML 경로 슬라이드를 Node 워커로 동시에 변환. html 경로 -> 결과 dict"""
+    html_slides = [(n, p) for n, kind, p in plan if kind == "html"]
+    missing = [(n, p) for n, p in html_slides if not p.exists()]
+    for n, p in missing:
+        report["failed"].append((n, f"HTML 파일 없음 ({p.name})"))
+    files = [p for n, p in html_slides if p.exists()]
+    if not files:
+        return {}
+
+    workers = max(1, min(workers or 4, len(files)))
+    chunks = [files[i::workers] for i in range(workers)]
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_convert_chunk, chunk, tempfile.mkdtemp(dir=work_dir), meta)
+                   for chunk in chunks]
+        for future in futures:
+            results.update(future.result())
+
+    by_path = {str(p): n for n, p in html_slides}
+    for html, record in results.items():
+        if "error" in record:
+            report["failed"].append((by_path.get(html, html), record["error"]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="template.ooxml 직접 채우기 PPTX 렌더링")
+    parser.add_argument("session_dir", help="session.yaml이 있는 세션 디렉토리")
+    parser.add_argument("--output", default=None, help="출력 경로 (기본: <session_dir>/output/presentation.pptx)")
+    parser.add_argument("--workers", type=int, default=None, help="HTML 경로 Node 워커 수")
+    parser.add_argument("--html-only", action="store_true", help="네이티브 경로를 쓰지 않고 모두 HTML 경로로")
+    args = parser.parse_args()
+
+    session_dir = Path(args.session_dir)
+    if not (session_dir / "session.yaml").exists():
+        print(f"오류: session.yaml이 존재하지 않습니다: {session_dir}")
+        sys.exit(1)
+
+    report = render_session(session_dir, args.output, args.workers, args.html_only)
+    for slide_number, error in report["failed"]:
+        print(f"[ERROR] Slide {slide_number}: {error}")
+    print(f"Native (OOXML): {len(report['native'])} slides {report['native']}")
+    print(f"HTML fallback: {len(report['html'])} slides {report['html']}")
+    print(f"\nCompleted in {report['elapsed']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+.pptx (OOXML 패키지) zip 수준 읽기 유틸리티
+
+python-pptx 없이 zipfile + ElementTree만으로 슬라이드 순서, 관계(rels),
+슬라이드별 참조 파트를 조회한다.
+"""
+
+import os
+import re
+import hashlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+NS = {
+    "p": "http://schemas.openxmlformats.org/presentationml/2006/main",
+    "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+REL_SLIDE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide"
+
+
+def rels_path(part_name: str) -> str:
+    """파트 이름에 대응하는 .rels 경로 (예: ppt/slides/slide1.xml -> ppt/slides/_rels/slide1.xml.rels)"""
+    directory, name = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", f"{name}.rels")
+
+
+def resolve_target(part_name: str, target: str) -> str:
+    """rels의 상대 Target을 패키지 내 절대 파트 이름으로 변환"""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part_name), target))
+
+
+def read_rels(zf: zipfile.ZipFile, part_name: str) -> list:
+    """
+    파트의 관계 목록 반환: [(rId, type, target_part 또는 외부 URL, is_external)]
+    """
+    path = rels_path(part_name)
+    if path not in zf.NameToInfo:
+        return []
+    root = ET.fromstring(zf.read(path))
+    rels = []
+    for rel in root.findall("rel:Relationship", NS):
+        external = rel.get("TargetMode") == "External"
+        target = rel.get("Target")
+        if not external:
+            target = resolve_target(part_name, target)
+        rels.append((rel.get("Id"), rel.get("Type"), target, external))
+    return rels
+
+
+def slide_part_names(zf: zipfile.ZipFile) -> list:
+    """presentation.xml의 sldIdLst 순서대로 슬라이드 파트 이름 반환"""
+    rel_targets = {rid: target for rid, rtype, target, external
+                   in read_rels(zf, "ppt/presentation.xml") if rtype == REL_SLIDE}
+    root = ET.fromstring(zf.read("ppt/presentation.xml"))
+    sld_ids = root.find("p:sldIdLst", NS)
+    if sld_ids is None:
+        return []
+    return [rel_targets[s.get(f"{{{NS['r']}}}id")] for s in sld_ids.findall("p:sldId", NS)]
+
+
+# 슬라이드 렌더링 결과에 영향이 없거나 역참조(마스터 -> 레이아웃 목록, 노트 -> 슬라이드)인 관계
+_DIGEST_SKIP_TYPES = ("/slide", "/notesSlide", "/notesMaster", "/handoutMaster")
+
+
+def _part_digest(zf: zipfile.ZipFile, part: str, cache: dict, visiting: set) -> str:
+    """
+    파트 XML + rels + 참조 파트 해시를 재귀적으로 합친 해시.
+    슬라이드 -> 레이아웃 -> 마스터 -> 테마 순으로 따라가며, 마스터의 레이아웃 목록은 따라가지 않는다.
+    """
+    if part in cache:
+        return cache[part]
+    visiting.add(part)
+    h = hashlib.sha256(zf.read(part))
+    rels = rels_path(part)
+    if rels in zf.NameToInfo:
+        h.update(zf.read(rels))
+    is_slide = part.startswith("ppt/slides/")
+    for _, rtype, target, external in read_rels(zf, part):
+        if external:
+            h.update(target.encode("utf-8"))
+        elif (target in zf.NameToInfo and target not in visiting
+              and not rtype.endswith(_DIGEST_SKIP_TYPES)
+              and (is_slide or not rtype.endswith("/slideLayout"))):
+            h.update(_part_digest(zf, target, cache, visiting).encode("ascii"))
+    visiting.discard(part)
+    cache[part] = h.hexdigest()
+    return cache[part]
+
+
+def slide_digests(pptx_path: str) -> list:
+    """
+    슬라이드 순서대로 슬라이드별 콘텐츠 해시 반환.
+
+    해시에는 슬라이드 XML과 rels, rels가 참조하는 이미지·미디어, 레이아웃 -> 마스터 -> 테마 체인,
+    그리고 presentation.xml의 슬라이드 크기(sldSz)가 포함된다.
+    """
+    digests = []
+    part_digests = {}  # 여러 슬라이드가 공유하는 레이아웃·마스터·이미지는 한 번만 해시
+    with zipfile.ZipFile(pptx_path) as zf:
+        size = re.search(rb"<p:sldSz\b[^>]*>", zf.read("ppt/presentation.xml"))
+        size = size.group(0) if size else b""
+        for part in slide_part_names(zf):
+            h = hashlib.sha256(size)
+            h.update(_part_digest(zf, part, part_digests, set()).encode("ascii"))
+            digests.append(h.hexdigest())
+    return digests
+
+
+# ---------------------------------------------------------------------------
+# 패키지 쓰기 (슬라이드 병합)
+# ---------------------------------------------------------------------------
+
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+REL_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/"
+REL_LAYOUT = REL_TYPE + "slideLayout"
+REL_MASTER = REL_TYPE + "slideMaster"
+REL_NOTES_SLIDE = REL_TYPE + "notesSlide"
+REL_NOTES_MASTER = REL_TYPE + "notesMaster"
+CT_SLIDE = "application/vnd.openxmlformats-officedocument.presentationml.slide+xml"
+CT_NOTES_SLIDE = "application/vnd.openxmlformats-officedocument.presentationml.notesSlide+xml"
+CT_MASTER = "application/vnd.openxmlformats-officedocument.presentationml.slideMaster+xml"
+CT_LAYOUT = "application/vnd.openxmlformats-officedocument.presentationml.slideLayout+xml"
+
+_SCALE_ATTR_RE = re.compile(r'(<a:(?:off|ext|chOff|chExt)\b[^>]*>)')
+_SCALE_VALUE_RE = re.compile(r'\b(x|y|cx|cy)="(-?\d+)"')
+_FONT_SIZE_RE = re.compile(r'(<a:(?:rPr|defRPr|endParaRPr)\b[^>]*?\bsz=")(\d+)(")')
+_SLIDE_SIZE_RE = re.compile(rb'<p:sldSz cx="(\d+)" cy="(\d+)"')
+_MASTER_ID_RE = re.compile(r'(<p:(?:sldMasterId|sldLayoutId)\b[^>]*?\bid=")(\d+)(")')
+# sldMasterId / sldLayoutId의 최솟값 (ECMA-376)
+MIN_MASTER_ID = 2147483648
+
+# 기준 패키지에서 그대로 공유하는 파트 (슬라이드는 이 파트들을 새로 복사하지 않고 참조)
+SHARED_PREFIXES = ("ppt/slideLayouts/", "ppt/slideMasters/", "ppt/theme/", "ppt/notesMasters/")
+# 슬라이드별로 새로 쓰는 파트 (기준 패키지에서 복사하지 않음)
+PER_SLIDE_PREFIXES = ("ppt/slides/", "ppt/notesSlides/", "ppt/charts/", "ppt/embeddings/")
+REWRITTEN_PARTS = {"[Content_Types].xml", "ppt/presentation.xml",
+                   "ppt/_rels/presentation.xml.rels", "docProps/app.xml"}
+
+
+def content_types(zf: zipfile.ZipFile) -> tuple:
+    """[Content_Types].xml -> (확장자 기본값 dict, 파트별 override dict)"""
+    root = ET.fromstring(zf.read("[Content_Types].xml"))
+    defaults = {d.get("Extension").lower(): d.get("ContentType")
+                for d in root.findall(f"{{{CT_NS}}}Default")}
+    overrides = {o.get("PartName").lstrip("/"): o.get("ContentType")
+                 for o in root.findall(f"{{{CT_NS}}}Override")}
+    return defaults, overrides
+
+
+def _xml_escape(value: str) -> str:
+    return (value.replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
+
+
+def rels_xml(rels: list) -> bytes:
+    """[(rId, type, target, is_external)] -> .rels XML (target은 이미 상대 경로)"""
+    items = []
+    for rid, rtype, target, external in rels:
+        mode = ' TargetMode="External"' if external else ""
+        items.append(f'<Relationship Id="{rid}" Type="{rtype}" Target="{_xml_escape(target)}"{mode}/>')
+    return ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Relationships xmlns="{NS["rel"]}">{"".join(items)}</Relationships>').encode("utf-8")
+
+
+def relative_target(source_part: str, target_part: str) -> str:
+    return posixpath.relpath(target_part, posixpath.dirname(source_part))
+
+
+def slide_size(zf: zipfile.ZipFile) -> tuple:
+    """presentation.xml의 슬라이드 크기 (cx, cy) EMU. 알 수 없으면 None."""
+    if "ppt/presentation.xml" not in zf.NameToInfo:
+        return None
+    m = _SLIDE_SIZE_RE.search(zf.read("ppt/presentation.xml"))
+    return (int(m.group(1)), int(m.group(2))) if m else None
+
+
+def scale_slide_xml(slide_xml: bytes, sx: float, sy: float = None) -> bytes:
+    """
+    슬라이드·레이아웃·마스터 XML의 도형 위치·크기를 가로 sx배, 세로 sy배로 조정
+    (슬라이드 크기가 다른 덱에 넣을 때). 글꼴 크기는 작은 쪽 배율을 따른다.
+    """
+    sy = sx if sy is None else sy
+    if abs(sx - 1.0) < 1e-6 and abs(sy - 1.0) < 1e-6:
+        return slide_xml
+    factors = {"x": sx, "cx": sx, "y": sy, "cy": sy}
+    font = min(sx, sy)
+    xml = slide_xml.decode("utf-8")
+
+    def scale_tag(match):
+        return _SCALE_VALUE_RE.sub(
+            lambda v: f'{v.group(1)}="{round(int(v.group(2)) * factors[v.group(1)])}"', match.group(1))
+
+    xml = _SCALE_ATTR_RE.sub(scale_tag, xml)
+    xml = _FONT_SIZE_RE.sub(lambda m: f"{m.group(1)}{max(100, round(int(m.group(2)) * font))}{m.group(3)}", xml)
+    return xml.encode("utf-8")
+
+
+class PackageWriter:
+    """
+    여러 소스 패키지의 슬라이드를 하나의 .pptx로 순서대로 병합하며 디스크에 바로 쓴다.
+
+    슬라이드 마스터·레이아웃·테마는 기준(base) 패키지 것을 공유한다. 다른 덱에서 온 슬라이드의
+    레이아웃이 기준 패키지에 없으면(레이아웃 -> 마스터 -> 테마 해시로 비교) 그 마스터와 레이아웃,
+    테마를 함께 복사해 presentation.xml에 마스터로 등록한다. 소스 덱의 슬라이드 크기가 다르면
+    복사한 마스터·레이아웃의 도형도 기준 크기에 맞게 조정한다. ppt/media 파트는 내용 해시로 중복 제거하여 한 번만 기록한다.
+    메모리에는 파트 목록과 미디어 해시만 유지하므로 슬라이드 수가 많아도 사용량이 일정하다.
+    """
+
+    def __init__(self, output_path: str, base_path: str):
+        self.output_path = output_path
+        self._tmp_path = output_path + ".tmp"
+        self._out = zipfile.ZipFile(self._tmp_path, "w", zipfile.ZIP_DEFLATED)
+        self._written = set()
+        self._media = {}  # sha256 -> 파트 이름
+        self._slides = []  # (slide 파트 이름, presentation rId)
+        self._notes = 0
+        self._copied = 0
+
+        self._base = zipfile.ZipFile(base_path)
+        self._defaults, self._base_overrides = content_types(self._base)
+        self._overrides = {}
+        self._src_types = (None, None)  # 마지막 소스 패키지의 content types 캐시
+        self._layouts = sorted(n for n in self._base.namelist()
+                               if n.startswith("ppt/slideLayouts/") and n.endswith(".xml"))
+        masters = [n for n in self._base.namelist() if n.startswith("ppt/notesMasters/")
+                   and n.endswith(".xml")]
+        self._notes_master = masters[0] if masters else None
+        # 레이아웃 체인 해시 -> 출력 레이아웃 파트 (같은 레이아웃은 이름이 달라도 공유)
+        base_digests = {}
+        self._layout_map = {_part_digest(self._base, name, base_digests, set()): name
+                            for name in reversed(self._layouts)}
+        self._digests = (None, None)  # 마지막 소스 패키지의 파트 해시 캐시
+        self._masters = []  # 복사한 마스터 (파트 이름, presentation rId, sldMasterId)
+        presentation = self._base.read("ppt/presentation.xml").decode("utf-8")
+        used_ids = [int(m.group(2)) for m in _MASTER_ID_RE.finditer(presentation)]
+        for name in self._base.namelist():
+            if name.startswith("ppt/slideMasters/") and name.endswith(".xml"):
+                used_ids += [int(m.group(2)) for m in
+                             _MASTER_ID_RE.finditer(self._base.read(name).decode("utf-8"))]
+        self._next_master_id = max(used_ids + [MIN_MASTER_ID - 1]) + 1
+        self._size = slide_size(self._base)
+
+        # 마스터/레이아웃/테마가 참조하는 미디어만 기준 패키지에서 가져온다
+        shared_media = set()
+        for name in self._base.namelist():
+            if name.startswith(SHARED_PREFIXES) and name.endswith(".xml"):
+                shared_media.update(t for _, _, t, ext in read_rels(self._base, name) if not ext)
+
+        for info in self._base.infolist():
+            name = info.filename
+            if name.endswith("/") or name in REWRITTEN_PARTS:
+                continue
+            if name.startswith(PER_SLIDE_PREFIXES):
+                continue
+            if name.startswith("ppt/media/"):
+                if name not in shared_media:
+                    continue
+                self._media[hashlib.sha256(self._base.read(name)).hexdigest()] = name
+            self._write(name, self._base.read(name))
+            if name in self._base_overrides:
+                self._overrides[name] = self._base_overrides[name]
+
+    # -----------------------------------------------------------------
+
+    def _write(self, name: str, data: bytes):
+        if name in self._written:
+            return
+        self._out.writestr(name, data)
+        self._written.add(name)
+
+    def _unique_name(self, name: str) -> str:
+        stem, ext = posixpath.splitext(name)
+        candidate, n = name, 1
+        while candidate in self._written:
+            candidate = f"{stem}_{n}{ext}"
+            n += 1
+        return candidate
+
+    def _numbered_name(self, prefix: str) -> str:
+        """prefix + 번호 + .xml 중 아직 쓰지 않은 다음 번호 (예: ppt/slideMasters/slideMaster2.xml)"""
+        n = 1
+        while f"{prefix}{n}.xml" in self._written:
+            n += 1
+        return f"{prefix}{n}.xml"
+
+    def _map_layout(self, src: zipfile.ZipFile, layout: str) -> str:
+        """소스 레이아웃에 대응하는 출력 레이아웃. 기준 패키지에 없으면 마스터째 복사한다."""
+        if layout not in src.NameToInfo:
+            return (self._layouts or [None])[0]
+        if self._digests[0] is not src:
+            self._digests = (src, {})
+        digest = _part_digest(src, layout, self._digests[1], set())
+        if digest not in self._layout_map:
+            master = next((t for _, rtype, t, ext in read_rels(src, layout)
+                           if rtype == REL_MASTER and not ext and t in src.NameToInfo), None)
+            if master is None:
+                return (self._layouts or [None])[0]
+            self._copy_master(src, master)
+        return self._layout_map[digest]
+
+    def _copy_master(self, src: zipfile.ZipFile, master: str):
+        """소스 마스터와 그 레이아웃 전체, 테마를 새 이름으로 복사하고 마스터로 등록"""
+        digests = self._digests[1]
+        master_name = self._numbered_name("ppt/slideMasters/slideMaster")
+        self._written.add(master_name)  # 레이아웃 이름을 고르기 전에 자리 확보
+        copied = {master: master_name}
+        src_size = slide_size(src)
+        sx, sy = ((self._size[0] / src_size[0], self._size[1] / src_size[1])
+                  if self._size and src_size else (1.0, 1.0))
+        layouts = [t for _, rtype, t, ext in read_rels(src, master)
+                   if rtype == REL_LAYOUT and not ext and t in src.NameToInfo]
+        for layout in layouts:
+            name = self._numbered_name("ppt/slideLayouts/slideLayout")
+            self._written.add(name)
+            copied[layout] = name
+            self._layout_map.setdefault(_part_digest(src, layout, digests, set()), name)
+
+        for part in [master] + layouts:
+            name = copied[part]
+            rels = self._map_rels(src, part, name, copied)
+            data = scale_slide_xml(src.read(part), sx, sy)
+            if part == master:
+                # 레이아웃 id는 프레젠테이션 전체(마스터 id 포함)에서 고유해야 한다
+                data = _MASTER_ID_RE.sub(self._fresh_master_id, data.decode("utf-8")).encode("utf-8")
+            self._written.discard(name)
+            self._write(name, data)
+            self._write(rels_path(name), rels_xml(rels))
+            self._register_type(src, part, name)
+            self._overrides.setdefault(name, CT_MASTER if part == master else CT_LAYOUT)
+
+        master_id = self._next_master_id
+        self._next_master_id += 1
+        self._masters.append((master_name, f"rIdMaster{len(self._masters) + 1}", master_id))
+
+    def _fresh_master_id(self, match) -> str:
+        self._next_master_id += 1
+        return f"{match.group(1)}{self._next_master_id - 1}{match.group(3)}"
+
+    def _copy_media(self, src: zipfile.ZipFile, part: str) -> str:
+        data = src.read(part)
+        digest = hashlib.sha256(data).hexdigest()
+        if digest not in self._media:
+            ext = posixpath.splitext(part)[1].lower()
+            name = f"ppt/media/media-{digest[:16]}{ext}"
+            self._write(name, data)
+            self._media[digest] = name
+            self._register_type(src, part, name)
+        return self._media[digest]
+
+    def _register_type(self, src: zipfile.ZipFile, src_part: str, dst_part: str):
+        if self._src_types[0] is not src:
+            self._src_types = (src, content_types(src))
+        src_defaults, src_overrides = self._src_types[1]
+        ext = posixpath.splitext(dst_part)[1].lstrip(".").lower()
+        if src_part in src_overrides:
+            self._overrides[dst_part] = src_overrides[src_part]
+        elif ext and ext not in self._defaults and ext in src_defaults:
+            self._defaults[ext] = src_defaults[ext]
+
+    def _copy_part(self, src: zipfile.ZipFile, part: str, copied: dict) -> str:
+        """차트·임베딩 등 기타 파트를 새 이름으로 복사하고 그 rels도 재귀적으로 복사"""
+        if part in copied:
+            return copied[part]
+        name = self._unique_name(part)
+        copied[part] = name
+        rels = self._map_rels(src, part, name, copied)
+        self._write(name, src.read(part))
+        if rels:
+            self._write(rels_path(name), rels_xml(rels))
+        self._register_type(src, part, name)
+        return name
+
+    def _map_rels(self, src: zipfile.ZipFile, src_part: str, dst_part: str, copied: dict,
+                  slide_part: str = None) -> list:
+        """소스 파트의 관계를 병합 패키지 기준 대상으로 변환"""
+        mapped = []
+        for rid, rtype, target, external in read_rels(src, src_part):
+            if external:
+                mapped.append((rid, rtype, target, True))
+                continue
+            if rtype in (REL_LAYOUT, REL_MASTER) and target in copied:
+                new_target = copied[target]  # 함께 복사 중인 마스터·레이아웃
+            elif rtype == REL_LAYOUT:
+                new_target = self._map_layout(src, target)
+            elif rtype == REL_NOTES_MASTER:
+                new_target = self._notes_master
+            elif rtype == REL_SLIDE and slide_part:
+                new_target = slide_part
+            elif rtype == REL_NOTES_SLIDE:
+                new_target = self._copy_notes(src, target, dst_part, copied) if self._notes_master else None
+            elif target.startswith("ppt/media/"):
+                new_target = self._copy_media(src, target) if target in src.NameToInfo else None
+            elif target in src.NameToInfo:
+                new_target = self._copy_part(src, target, copied)
+            else:
+                new_target = None
+            if new_target:
+                mapped.append((rid, rtype, relative_target(dst_part, new_target), False))
+        return mapped
+
+    def _copy_notes(self, src: zipfile.ZipFile, part: str, slide_part: str, copied: dict) -> str:
+        self._notes += 1
+        name = f"ppt/notesSlides/notesSlide{self._notes}.xml"
+        rels = self._map_rels(src, part, name, copied, slide_part=slide_part)
+        self._write(name, src.read(part))
+        self._write(rels_path(name), rels_xml(rels))
+        self._overrides[name] = CT_NOTES_SLIDE
+        return name
+
+    # -----------------------------------------------------------------
+
+    def add_slide(self, src: zipfile.ZipFile, slide_part: str) -> str:
+        """소스 패키지의 슬라이드 1장을 다음 순서로 추가하고 새 파트 이름 반환"""
+        return self.add_slide_xml(src.read(slide_part), src, slide_part)
+
+    def add_slide_xml(self, slide_xml: bytes, src: zipfile.ZipFile, src_part: str) -> str:
+        """
+        슬라이드 XML을 추가. 관계(rels)는 src 패키지의 src_part 기준으로 해석한다.
+        (src_part의 XML 대신 slide_xml을 쓰므로 채워 넣은 XML을 기록할 때 사용)
+        """
+        index = len(self._slides) + 1
+        name = f"ppt/slides/slide{index}.xml"
+        rels = self._map_rels(src, src_part, name, {})
+        self._write(name, slide_xml)
+        self._write(rels_path(name), rels_xml(rels))
+        self._overrides[name] = CT_SLIDE
+        self._slides.append((name, f"rIdSlide{index}"))
+        return name
+
+    @property
+    def slide_count(self) -> int:
+        return len(self._slides)
+
+    def close(self):
+        """presentation.xml, rels, [Content_Types].xml을 기록하고 출력 파일 확정"""
+        base_rels = [r for r in read_rels(self._base, "ppt/presentation.xml") if r[1] != REL_SLIDE]
+        pres_rels = [(rid, rtype, relative_target("ppt/presentation.xml", t) if not ext else t, ext)
+                     for rid, rtype, t, ext in base_rels]
+        pres_rels += [(rid, REL_MASTER, relative_target("ppt/presentation.xml", part), False)
+                      for part, rid, _ in self._masters]
+        pres_rels += [(rid, REL_SLIDE, relative_target("ppt/presentation.xml", part), False)
+                      for part, rid in self._slides]
+        self._write("ppt/_rels/presentation.xml.rels", rels_xml(pres_rels))
+
+        sld_ids = "".join(f'<p:sldId id="{256 + i}" r:id="{rid}"/>'
+                          for i, (_, rid) in enumerate(self._slides))
+        presentation = self._base.read("ppt/presentation.xml").decode("utf-8")
+        presentation = re.sub(r"<p:sldIdLst>.*?</p:sldIdLst>|<p:sldIdLst/>", "", presentation,
+                              flags=re.S)
+        master_ids = "".join(f'<p:sldMasterId id="{master_id}" r:id="{rid}"/>'
+                             for _, rid, master_id in self._masters)
+        presentation = re.sub(r"(</p:sldMasterIdLst>)",
+                              rf"{master_ids}\1<p:sldIdLst>{sld_ids}</p:sldIdLst>",
+                              presentation, count=1)
+        self._write("ppt/presentation.xml", presentation.encode("utf-8"))
+        self._overrides["ppt/presentation.xml"] = self._base_overrides["ppt/presentation.xml"]
+
+        self._write("docProps/app.xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Properties xmlns="http://schemas.openxmlformats.org/officeDocument/2006/extended-properties">'
+            f'<Application>ppt-gen</Application><Slides>{len(self._slides)}</Slides>'
+            f'<Notes>{self._notes}</Notes></Properties>').encode("utf-8"))
+        self._overrides["docProps/app.xml"] = \
+            "application/vnd.openxmlformats-officedocument.extended-properties+xml"
+
+        types = [f'<Default Extension="{ext}" ContentType="{ct}"/>'
+                 for ext, ct in sorted(self._defaults.items())]
+        types += [f'<Override PartName="/{name}" ContentType="{ct}"/>'
+                  for name, ct in sorted(self._overrides.items()) if name in self._written]
+        self._write("[Content_Types].xml", (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<Types xmlns="{CT_NS}">{"".join(types)}</Types>').encode("utf-8"))
+
+        self._out.close()
+        self._base.close()
+        os.replace(self._tmp_path, self.output_path)
+
+    def abort(self):
+        self._out.close()
+        self._base.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+증분 렌더링용 슬라이드 해시 매니페스트
+
+각 슬라이드의 content, 템플릿 id, 템플릿 파일, 테마를 해시하여
+세션 디렉토리의 .render_manifest.json에 기록한다.
+다음 렌더링에서는 해시가 바뀐 슬라이드만 다시 렌더링한다.
+"""
+
+import json
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+MANIFEST_NAME = ".render_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_digest(path: Path) -> str:
+    """파일 내용의 sha256 (파일이 없으면 빈 문자열)"""
+    path = Path(path)
+    if not path.is_file():
+        return ""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def theme_digest(theme_id: str, themes_dir: Path) -> str:
+    """
+    themes_dir 아래 theme_id 디렉토리(내부 파일 전체) 또는 theme_id.<확장자> 파일의 해시.
+    이름이 theme_id로 시작하는 다른 테마(deep-green-dark 등)는 포함하지 않는다.
+    """
+    h = hashlib.sha256(theme_id.encode("utf-8"))
+    themes_dir = Path(themes_dir)
+    if themes_dir.is_dir():
+        entries = [p for p in themes_dir.iterdir() if p.name == theme_id
+                   or (p.is_file() and p.stem == theme_id)]
+        for entry in sorted(entries):
+            files = sorted(p for p in entry.rglob("*") if p.is_file()) if entry.is_dir() else [entry]
+            for p in files:
+                h.update(str(p.relative_to(themes_dir)).encode("utf-8"))
+                h.update(file_digest(p).encode("ascii"))
+    return h.hexdigest()
+
+
+def slide_digest(content: dict, template_id: str, template_hash: str, theme_hash: str) -> str:
+    """슬라이드 1장의 렌더링 입력 해시"""
+    payload = json.dumps({
+        "content": content,
+        "template_id": template_id,
+        "template": template_hash,
+        "theme": theme_hash,
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RenderPlan:
+    """증분 렌더링 계획"""
+    render: list = field(default_factory=list)     # 다시 렌더링할 슬라이드 번호
+    unchanged: list = field(default_factory=list)  # 해시가 같아 건너뛸 슬라이드 번호
+    orphans: list = field(default_factory=list)    # 삭제할 slide_NN_*.html 경로
+    digests: dict = field(default_factory=dict)    # 슬라이드 번호 -> 새 해시
+
+
+class RenderManifest:
+    """세션 디렉토리의 렌더링 매니페스트"""
+
+    def __init__(self, session_dir: Path):
+        self.path = Path(session_dir) / MANIFEST_NAME
+        self.slides = {}
+        if self.path.exists():
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == MANIFEST_VERSION:
+                    self.slides = data.get("slides", {})
+            except (OSError, ValueError):
+                # 손상된 매니페스트는 무시하고 전체 렌더링
+                self.slides = {}
+
+    def plan(self, session: dict, slides_dir: Path, template_paths: dict,
+             theme_id: str, themes_dir: Path, filename_fn) -> RenderPlan:
+        """현재 session.yaml 기준으로 다시 렌더링할 슬라이드와 고아 파일 계산"""
+        slides_dir = Path(slides_dir)
+        theme_hash = theme_digest(theme_id, themes_dir)
+        template_hashes = {}
+        plan = RenderPlan()
+        expected_files = set()
+
+        for slide in session.get("slides", []):
+            slide_num = slide["slide_number"]
+            template_id = slide["template"]["id"]
+            filename = filename_fn(slide)
+            expected_files.add(filename)
+
+            if template_id not in template_hashes:
+                template_hashes[template_id] = file_digest(template_paths.get(template_id, ""))
+            digest = slide_digest(slide.get("content", {}), template_id,
+                                  template_hashes[template_id], theme_hash)
+            plan.digests[slide_num] = digest
+
+            previous = self.slides.get(str(slide_num), {})
+            if (previous.get("hash") == digest and previous.get("file") == filename
+                    and (slides_dir / filename).exists()):
+                plan.unchanged.append(slide_num)
+            else:
+                plan.render.append(slide_num)
+
+        if slides_dir.is_dir():
+            plan.orphans = sorted(p for p in slides_dir.glob("slide_*.html")
+                                  if p.name not in expected_files)
+        return plan
+
+    def update(self, plan: RenderPlan, results: list):
+        """렌더링 결과를 반영. 성공한 슬라이드만 새 해시로 기록한다."""
+        current = {str(n) for n in plan.digests}
+        self.slides = {k: v for k, v in self.slides.items() if k in current}
+        for r in results:
+            key = str(r.slide_number)
+            if r.status == "ok":
+                self.slides[key] = {"hash": plan.digests[r.slide_number], "file": r.filename}
+            else:
+                self.slides.pop(key, None)
+
+    def save(self):
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "slides": self.slides},
+                      f, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp_path.replace(self.path)
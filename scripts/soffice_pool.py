@@ -0,0 +1,515 @@
+#!/usr/bin/env python3
+"""
+LibreOffice headless 변환 워커 풀 (.pptx -> pdf/png)
+
+워커마다 독립된 사용자 프로필 디렉토리를 사용하므로 동시 호출이 기본 프로필에서
+충돌하지 않는다. python3-uno가 설치되어 있으면 워커가 soffice 프로세스를 계속 띄워 두고
+UNO 소켓으로 변환(warm)하며, 없으면 작업마다 soffice --convert-to를 실행하되
+미리 초기화한 프로필을 재사용한다.
+
+작업은 로컬 큐로 제출하고, 작업 시간 초과 시 해당 워커의 soffice(프로세스 그룹 전체)를
+종료하고 재시작한다. 서버는 기동할 때마다 임의의 인증 키를 만들어 사용자만 읽을 수 있는
+키 파일(~/.cache/ppt-gen/soffice-pool-<port>.key, 0600)에 저장하고, 클라이언트는 이 파일
+또는 PPTGEN_SOFFICE_AUTHKEY 환경 변수에서 키를 읽는다.
+
+사용법:
+    python scripts/soffice_pool.py serve [--workers N] [--port PORT] [--timeout SEC]
+    python scripts/soffice_pool.py convert <input.pptx> <output_dir> [--format pdf|png]
+    python scripts/soffice_pool.py metrics
+
+예시:
+    python scripts/soffice_pool.py serve --workers 4 &
+    export PPTGEN_SOFFICE_POOL=127.0.0.1:8765
+    python scripts/generate_thumbnails.py ppt-sample/깔끔이-딥그린.pptx /tmp/thumbs
+"""
+
+import sys
+import os
+import time
+import queue
+import signal
+import shutil
+import socket
+import secrets
+import argparse
+import tempfile
+import threading
+import subprocess
+from concurrent.futures import Future
+from contextlib import contextmanager
+from multiprocessing.managers import BaseManager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+POOL_ENV = "PPTGEN_SOFFICE_POOL"
+AUTHKEY_ENV = "PPTGEN_SOFFICE_AUTHKEY"
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 120
+STARTUP_TIMEOUT = 60
+STATE_DIR = Path.home() / ".cache" / "ppt-gen"
+# 풀 없이 변환할 때 재사용하는 프로필 수 (동시 실행 시 잠기지 않은 프로필을 차례로 사용)
+ONESHOT_PROFILES = 4
+
+EXPORT_FILTERS = {
+    "pdf": "impress_pdf_Export",
+    "png": "impress_png_Export",
+}
+
+
+def soffice_binary() -> str:
+    return shutil.which("soffice") or shutil.which("libreoffice") or "libreoffice"
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _run_soffice(args: list, timeout: float) -> subprocess.CompletedProcess:
+    """
+    soffice를 새 세션(프로세스 그룹)으로 실행한다. 시간 초과 시 런처뿐 아니라
+    soffice.bin까지 그룹 전체를 종료하고 TimeoutExpired를 올린다.
+    """
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                               start_new_session=True)
+    try:
+        _, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _kill_group(process)
+        process.communicate()
+        raise
+    return subprocess.CompletedProcess(args, process.returncode, None, stderr)
+
+
+def _kill_group(process: subprocess.Popen):
+    if process.poll() is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        # Windows 등 프로세스 그룹이 없는 환경
+        process.kill()
+
+
+def _has_uno() -> bool:
+    try:
+        import uno  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ConversionTimeout(Exception):
+    """변환 작업이 제한 시간 안에 끝나지 않음"""
+
+
+class SofficeWorker:
+    """독립 프로필을 가진 LibreOffice 워커 1개"""
+
+    def __init__(self, name: str, profile_root: str, timeout: float = DEFAULT_TIMEOUT,
+                 use_uno: bool = None):
+        self.name = name
+        self.profile_dir = os.path.join(profile_root, name)
+        self.timeout = timeout
+        self.use_uno = _has_uno() if use_uno is None else use_uno
+        self.process = None
+        self.port = None
+        self.restarts = 0
+        self._desktop = None
+        self._ready = False  # start()가 끝까지 성공했는지 (재시작 실패 시 False로 남음)
+
+    @property
+    def profile_url(self) -> str:
+        return Path(self.profile_dir).as_uri()
+
+    def _base_args(self) -> list:
+        return [soffice_binary(), f"-env:UserInstallation={self.profile_url}",
+                "--headless", "--invisible", "--nologo", "--norestore", "--nodefault"]
+
+    def start(self):
+        """워커 기동. UNO 모드는 soffice를 띄워 두고, 아니면 프로필만 초기화한다."""
+        self._ready = False
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if not self.use_uno:
+            if not os.listdir(self.profile_dir):
+                # 첫 실행 시 프로필 생성 비용을 기동 시점에 미리 지불
+                _run_soffice(self._base_args() + ["--terminate_after_init"], STARTUP_TIMEOUT)
+            self._ready = True
+            return
+
+        self.port = _free_port()
+        self.process = subprocess.Popen(
+            self._base_args() + [f"--accept=socket,host=127.0.0.1,port={self.port};urp;"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+        self._desktop = self._connect()
+        self._ready = True
+
+    def _connect(self):
+        import uno
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local)
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                ctx = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext")
+                return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+            except Exception:
+                if time.monotonic() > deadline or self.process.poll() is not None:
+                    raise RuntimeError(f"{self.name}: soffice 기동 실패")
+                time.sleep(0.25)
+
+    def stop(self):
+        self._ready = False
+        if self.process and self.process.poll() is None:
+            _kill_group(self.process)
+            self.process.wait()
+        self.process = None
+        self._desktop = None
+
+    def restart(self):
+        """soffice를 종료하고 프로필을 새로 만든다 (시간 초과로 잠기거나 손상된 프로필 정리)"""
+        self.stop()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+        self.restarts += 1
+        self.start()
+
+    def healthy(self) -> bool:
+        """
+        워커 상태 확인. UNO 모드는 프로세스 생존과 소켓 응답을, subprocess 모드는
+        마지막 기동 성공 여부와 soffice 실행 파일, 초기화된 프로필이 남아 있는지 확인한다.
+        """
+        if not self._ready:
+            return False
+        if not self.use_uno:
+            return (shutil.which(soffice_binary()) is not None
+                    and os.path.isdir(self.profile_dir) and bool(os.listdir(self.profile_dir)))
+        if self.process is None or self.process.poll() is not None:
+            return False
+        try:
+            self._desktop.getFrames()
+            return True
+        except Exception:
+            return False
+
+    def convert(self, input_path: str, output_dir: str, fmt: str = "pdf") -> str:
+        """input_path를 output_dir/<stem>.<fmt>로 변환하고 출력 경로 반환"""
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, f"{Path(input_path).stem}.{fmt}")
+        if self.use_uno:
+            self._convert_uno(input_path, output_path, fmt)
+        else:
+            try:
+                _run_soffice(self._base_args() + ["--convert-to", fmt, "--outdir", output_dir,
+                                                  input_path], self.timeout).check_returncode()
+            except subprocess.TimeoutExpired:
+                raise ConversionTimeout(f"{self.name}: {self.timeout}s 초과 ({input_path})")
+        if not os.path.exists(output_path):
+            raise RuntimeError(f"{self.name}: 변환 결과가 없습니다: {output_path}")
+        return output_path
+
+    def _convert_uno(self, input_path: str, output_path: str, fmt: str):
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def prop(name, value):
+            p = PropertyValue()
+            p.Name, p.Value = name, value
+            return p
+
+        error = []
+
+        def run():
+            try:
+                doc = self._desktop.loadComponentFromURL(
+                    uno.systemPathToFileUrl(os.path.abspath(input_path)), "_blank", 0,
+                    (prop("Hidden", True),))
+                try:
+                    doc.storeToURL(uno.systemPathToFileUrl(os.path.abspath(output_path)),
+                                   (prop("FilterName", EXPORT_FILTERS[fmt]),))
+                finally:
+                    doc.close(True)
+            except Exception as e:
+                error.append(e)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(self.timeout)
+        if thread.is_alive():
+            raise ConversionTimeout(f"{self.name}: {self.timeout}s 초과 ({input_path})")
+        if error:
+            raise error[0]
+
+
+class ConversionPool:
+    """
+    LibreOffice 워커 풀과 작업 큐.
+
+    submit()은 concurrent.futures.Future를 반환한다. 시간 초과 또는 비정상 워커는
+    재시작 후 다음 작업을 처리한다.
+    """
+
+    def __init__(self, workers: int = 2, timeout: float = DEFAULT_TIMEOUT,
+                 profile_root: str = None, use_uno: bool = None):
+        self._own_profile_root = profile_root is None
+        self.profile_root = profile_root or tempfile.mkdtemp(prefix="soffice-pool-")
+        self.workers = [SofficeWorker(f"worker-{i}", self.profile_root, timeout, use_uno)
+                        for i in range(workers)]
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "failed": 0, "timeouts": 0, "busy": 0}
+        self._threads = []
+        self._started = False
+
+    def start(self):
+        if self._started:
+            return self
+        for worker in self.workers:
+            worker.start()
+            thread = threading.Thread(target=self._run, args=(worker,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._started = True
+        return self
+
+    def shutdown(self):
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        for worker in self.workers:
+            worker.stop()
+        if self._own_profile_root:
+            shutil.rmtree(self.profile_root, ignore_errors=True)
+        self._threads = []
+        self._started = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def submit(self, input_path: str, output_dir: str, fmt: str = "pdf") -> Future:
+        if fmt not in EXPORT_FILTERS:
+            raise ValueError(f"지원하지 않는 형식: {fmt}")
+        future = Future()
+        with self._lock:
+            self._stats["submitted"] += 1
+        self._queue.put((future, input_path, output_dir, fmt))
+        return future
+
+    def convert(self, input_path: str, output_dir: str, fmt: str = "pdf") -> str:
+        """작업을 제출하고 완료될 때까지 대기"""
+        return self.submit(input_path, output_dir, fmt).result()
+
+    def metrics(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["workers"] = len(self.workers)
+        stats["restarts"] = sum(w.restarts for w in self.workers)
+        stats["healthy"] = sum(1 for w in self.workers if w.healthy())
+        stats["mode"] = "uno" if self.workers and self.workers[0].use_uno else "subprocess"
+        return stats
+
+    def _run(self, worker: SofficeWorker):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            future, input_path, output_dir, fmt = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            with self._lock:
+                self._stats["busy"] += 1
+            result, error = None, None
+            try:
+                if not worker.healthy():
+                    worker.restart()
+                result = worker.convert(input_path, output_dir, fmt)
+                outcome = "completed"
+            except ConversionTimeout as e:
+                error, outcome = e, "timeouts"
+                try:
+                    worker.restart()
+                except Exception as restart_error:
+                    # 워커는 unhealthy로 남고 다음 작업에서 재시작을 다시 시도한다
+                    error = ConversionTimeout(f"{e} (재시작 실패: {restart_error})")
+            except Exception as e:
+                error, outcome = e, "failed"
+
+            # 통계를 먼저 갱신한 뒤 결과를 알려야 호출자가 보는 metrics()가 일관된다
+            with self._lock:
+                self._stats["busy"] -= 1
+                self._stats[outcome] += 1
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+
+# ---------------------------------------------------------------------------
+# 로컬 작업 큐 서버 (다른 프로세스에서 접속)
+# ---------------------------------------------------------------------------
+
+class PoolManager(BaseManager):
+    pass
+
+
+def _authkey_path(port: int) -> Path:
+    return STATE_DIR / f"soffice-pool-{port}.key"
+
+
+def _write_authkey(port: int) -> bytes:
+    """서버용 인증 키. 환경 변수가 없으면 임의로 만들어 0600 키 파일에 저장한다."""
+    key = os.environ.get(AUTHKEY_ENV) or secrets.token_hex(32)
+    path = _authkey_path(port)
+    path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.unlink(missing_ok=True)
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(key)
+    os.replace(tmp_path, path)
+    return key.encode("utf-8")
+
+
+def _read_authkey(port: int) -> bytes:
+    key = os.environ.get(AUTHKEY_ENV)
+    if key:
+        return key.encode("utf-8")
+    try:
+        return _authkey_path(port).read_text(encoding="utf-8").strip().encode("utf-8")
+    except OSError:
+        raise RuntimeError(f"풀 인증 키가 없습니다: {_authkey_path(port)} "
+                           f"(서버를 같은 사용자로 실행하거나 {AUTHKEY_ENV} 설정)")
+
+
+def _parse_address(address: str) -> tuple:
+    host, _, port = address.rpartition(":")
+    return (host or "127.0.0.1", int(port))
+
+
+def serve(workers: int, port: int, timeout: float):
+    """풀을 기동하고 127.0.0.1:port에서 convert/metrics 요청을 받는다."""
+    pool = ConversionPool(workers, timeout).start()
+    PoolManager.register("convert", callable=pool.convert)
+    PoolManager.register("metrics", callable=pool.metrics)
+    manager = PoolManager(address=("127.0.0.1", port), authkey=_write_authkey(port))
+    server = manager.get_server()
+    print(f"LibreOffice 변환 풀 실행 중: 127.0.0.1:{port} "
+          f"(workers={workers}, mode={pool.metrics()['mode']})")
+    try:
+        server.serve_forever()
+    finally:
+        pool.shutdown()
+        _authkey_path(port).unlink(missing_ok=True)
+
+
+def connect(address: str = None):
+    """실행 중인 풀 서버에 접속. address가 없으면 PPTGEN_SOFFICE_POOL 환경 변수 사용."""
+    address = address or os.environ.get(POOL_ENV) or f"127.0.0.1:{DEFAULT_PORT}"
+    PoolManager.register("convert")
+    PoolManager.register("metrics")
+    host, port = _parse_address(address)
+    manager = PoolManager(address=(host, port), authkey=_read_authkey(port))
+    manager.connect()
+    return manager
+
+
+def convert_document(input_path: str, output_dir: str, fmt: str = "pdf") -> str:
+    """
+    .pptx 변환 진입점.
+
+    PPTGEN_SOFFICE_POOL이 설정되어 있으면 풀 서버에 작업을 제출하고,
+    아니면 사용자별로 유지되는 프로필(잠금으로 보호)로 soffice를 한 번 실행한다.
+    """
+    if os.environ.get(POOL_ENV):
+        manager = connect()
+        return manager.convert(os.path.abspath(input_path), os.path.abspath(output_dir), fmt)._getvalue()
+
+    with _oneshot_profile() as name:
+        worker = SofficeWorker(name, str(STATE_DIR), use_uno=False)
+        worker.start()
+        try:
+            return worker.convert(input_path, output_dir, fmt)
+        except ConversionTimeout:
+            # 중간에 종료된 프로필은 다음 실행에서 새로 만든다
+            shutil.rmtree(worker.profile_dir, ignore_errors=True)
+            raise
+
+
+@contextmanager
+def _oneshot_profile():
+    """
+    잠기지 않은 재사용 프로필 이름을 잠근 채로 돌려준다. 모두 사용 중이면 첫 번째를 기다린다.
+    같은 프로필을 두 soffice가 동시에 쓰면 변환이 실패하므로 파일 잠금으로 보호한다.
+    """
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        name = f"soffice-profile-{os.getpid()}"
+        try:
+            yield name
+        finally:
+            shutil.rmtree(STATE_DIR / name, ignore_errors=True)
+        return
+
+    names = [f"soffice-profile-{i}" for i in range(ONESHOT_PROFILES)]
+    for blocking, candidates in ((False, names), (True, names[:1])):
+        for name in candidates:
+            lock_file = open(STATE_DIR / f"{name}.lock", "w")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            try:
+                yield name
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LibreOffice 변환 워커 풀")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_serve = sub.add_parser("serve", help="워커 풀 서버 실행")
+    p_serve.add_argument("--workers", type=int, default=2, help="워커 수 (기본: 2)")
+    p_serve.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본: {DEFAULT_PORT})")
+    p_serve.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                         help=f"작업 제한 시간(초), 초과 시 워커 재시작 (기본: {DEFAULT_TIMEOUT})")
+
+    p_convert = sub.add_parser("convert", help="파일 1개 변환")
+    p_convert.add_argument("input_path")
+    p_convert.add_argument("output_dir")
+    p_convert.add_argument("--format", choices=sorted(EXPORT_FILTERS), default="pdf")
+
+    sub.add_parser("metrics", help="실행 중인 풀의 큐 깊이/상태 출력")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.workers, args.port, args.timeout)
+    elif args.command == "convert":
+        if not os.path.exists(args.input_path):
+            print(f"오류: 입력 파일이 존재하지 않습니다: {args.input_path}")
+            sys.exit(1)
+        print(f"생성됨: {convert_document(args.input_path, args.output_dir, args.format)}")
+    else:
+        metrics = connect().metrics()._getvalue()
+        for key, value in sorted(metrics.items()):
+            print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
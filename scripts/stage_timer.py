@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계별 시간·메모리 계측 (opt-in)
+
+PPTGEN_STAGE_TIMINGS 환경변수가 설정된 경우에만 기록하며, 설정되지 않으면
+stage()는 아무 일도 하지 않는다. 프로세스가 끝날 때 결과를 JSON으로 남긴다.
+
+    PPTGEN_STAGE_TIMINGS=timings.json   -> 파일에 저장
+    PPTGEN_STAGE_TIMINGS=-              -> stderr에 출력
+
+출력 형식:
+    {"stages": {"<단계>": {"seconds": 합계, "calls": 횟수,
+                           "rss_start_mb": 첫 진입 시점 RSS, "rss_end_mb": 마지막 종료 시점 RSS}},
+     "peak_rss_mb": {"self": .., "children": ..}}
+
+RSS는 현재 값(/proc/self/statm, 없으면 psutil)이며, 둘 다 쓸 수 없으면 단계 RSS 필드를 생략한다.
+peak_rss_mb는 프로세스 전체의 최대값(ru_maxrss)으로 resource 모듈이 없는 Windows에서는 null이다.
+
+사용 예:
+    from stage_timer import stage
+
+    with stage("pdf_convert"):
+        convert_document(...)
+
+    PPTGEN_STAGE_TIMINGS=- python working/session-20260116-150546/rerender_slides.py
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENV_VAR = "PPTGEN_STAGE_TIMINGS"
+# 결과를 기록할 프로세스 (워커 프로세스는 환경변수를 물려받아도 파일을 덮어쓰지 않는다)
+OWNER_ENV_VAR = "PPTGEN_STAGE_TIMINGS_PID"
+
+_enabled = bool(os.environ.get(ENV_VAR))
+_stages = {}
+
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(flag: bool = True):
+    """환경변수 없이 코드에서 계측을 켜고 끈다 (benchmark.py에서 사용)"""
+    global _enabled
+    _enabled = flag
+
+
+def reset():
+    _stages.clear()
+
+
+def _max_rss_mb(who) -> float:
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux는 KB, macOS는 byte 단위
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def peak_rss_mb() -> dict:
+    if resource is None:
+        return {"self": None, "children": None}
+    return {"self": _max_rss_mb(resource.RUSAGE_SELF),
+            "children": _max_rss_mb(resource.RUSAGE_CHILDREN)}
+
+
+def current_rss_mb():
+    """현재 프로세스 RSS (MB). 측정할 수 없으면 None."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return round(pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return round(psutil.Process().memory_info().rss / (1024 * 1024), 1)
+
+
+def record(name: str, seconds: float, calls: int = 1):
+    """측정한 시간을 단계에 더한다 (워커 프로세스에서 돌려받은 시간 등)"""
+    if not _enabled:
+        return
+    entry = _stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+    entry["seconds"] += seconds
+    entry["calls"] += calls
+
+
+@contextmanager
+def stage(name: str):
+    if not _enabled:
+        yield
+        return
+    rss_start = current_rss_mb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+        rss_end = current_rss_mb()
+        if rss_end is not None:
+            _stages[name].setdefault("rss_start_mb", rss_start)
+            _stages[name]["rss_end_mb"] = rss_end
+
+
+def report() -> dict:
+    return {
+        "stages": {name: {**entry, "seconds": round(entry["seconds"], 4)}
+                   for name, entry in _stages.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def write_report(dest: str = None):
+    """dest('-'는 stderr)에 JSON 기록. 기본값은 환경변수 값."""
+    dest = dest or os.environ.get(ENV_VAR)
+    if not dest or not _stages:
+        return
+    text = json.dumps(report(), ensure_ascii=False, indent=2)
+    if dest in ("-", "1"):
+        print(text, file=sys.stderr)
+        return
+    tmp_path = f"{dest}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, dest)
+
+
+if _enabled and os.environ.get(OWNER_ENV_VAR, str(os.getpid())) == str(os.getpid()):
+    os.environ[OWNER_ENV_VAR] = str(os.getpid())
+    atexit.register(write_report)
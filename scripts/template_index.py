@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+컴파일된 템플릿 레지스트리 인덱스
+
+templates/contents/registry.yaml과 각 템플릿의 template.yaml을 읽어
+카테고리, 요소 개수, 키워드, use_for 용어, design_intent, information_density에 대한
+역색인(inverted index)을 만들고 pickle로 저장한다.
+registry.yaml 또는 template.yaml 중 하나라도 mtime이 바뀌면 자동으로 다시 빌드한다.
+
+규칙 기반 필터링(research/템플릿_매칭_알고리즘.md Step 1)을 선형 탐색 대신
+역색인 교집합과 가중치 합산으로 수행한다.
+
+사용법:
+    python scripts/template_index.py build
+    python scripts/template_index.py query [--category CAT] [--count N] [--density D]
+                                           [--intent INTENT] [--limit K] [검색어 ...]
+
+예시:
+    python scripts/template_index.py query --category diagram --count 5 조직도 계층
+"""
+
+import re
+import os
+import sys
+import time
+import pickle
+import argparse
+from collections import defaultdict
+from pathlib import Path
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+TEMPLATES_DIR = PROJECT_ROOT / "templates"
+REGISTRY_PATH = TEMPLATES_DIR / "contents" / "registry.yaml"
+INDEX_PATH = TEMPLATES_DIR / "contents" / ".registry_index.pkl"
+INDEX_VERSION = 1
+
+# 필드별 점수 가중치
+WEIGHTS = {
+    "keyword": 3.0,
+    "name": 2.0,
+    "use_for": 1.0,
+    "design_intent": 1.5,
+}
+FLEXIBLE_COUNT = "*"
+
+_TOKEN_RE = re.compile(r"[\w]+", re.UNICODE)
+
+
+def tokenize(text: str) -> list:
+    """공백·구두점 기준 토큰화 (소문자). '막대 차트' -> ['막대', '차트']"""
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def _load_yaml(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YamlLoader) or {}
+
+
+def _source_files(registry_path: Path, registry: dict) -> list:
+    """인덱스가 의존하는 파일 목록 (registry.yaml + 각 template.yaml)"""
+    files = [registry_path]
+    for entry in registry.get("templates", []):
+        files.append(TEMPLATES_DIR / entry["path"] / "template.yaml")
+    return files
+
+
+def _fingerprint(files: list) -> dict:
+    stamps = {}
+    for path in files:
+        try:
+            stamps[str(path)] = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            stamps[str(path)] = None
+    return stamps
+
+
+def _element_count(entry: dict, template: dict):
+    """registry의 item_count, 없으면 template.yaml design_meta의 *_count 값"""
+    if entry.get("item_count") is not None:
+        return int(entry["item_count"])
+    for key, value in template.get("design_meta", {}).items():
+        if key.endswith("_count") and isinstance(value, int):
+            return value
+    return None
+
+
+class TemplateIndex:
+    """
+    템플릿 역색인.
+
+    entries: 문서 번호 -> 레지스트리 항목(요약)
+    postings: 필드 -> 토큰 -> {문서 번호: 가중치}
+    """
+
+    def __init__(self, entries: list, postings: dict, facets: dict, fingerprint: dict):
+        self.entries = entries
+        self.postings = postings
+        self.facets = facets
+        self.fingerprint = fingerprint
+        self.by_id = {e["id"]: i for i, e in enumerate(entries)}
+
+    # -----------------------------------------------------------------
+    # 빌드 / 로드
+    # -----------------------------------------------------------------
+
+    @classmethod
+    def build(cls, registry_path: Path = REGISTRY_PATH) -> "TemplateIndex":
+        registry = _load_yaml(registry_path)
+        entries = []
+        postings = defaultdict(lambda: defaultdict(dict))
+        facets = defaultdict(lambda: defaultdict(set))
+
+        for doc, entry in enumerate(registry.get("templates", [])):
+            template_yaml = TEMPLATES_DIR / entry["path"] / "template.yaml"
+            template = _load_yaml(template_yaml) if template_yaml.exists() else {}
+
+            summary = {k: v for k, v in entry.items()}
+            summary["item_count"] = _element_count(entry, template)
+            summary["shape_count"] = len(template.get("shapes", []) or [])
+            entries.append(summary)
+
+            facets["category"][entry.get("category")].add(doc)
+            facets["information_density"][entry.get("information_density")].add(doc)
+            facets["design_intent"][entry.get("design_intent")].add(doc)
+            count_key = FLEXIBLE_COUNT if summary["item_count"] is None else summary["item_count"]
+            facets["item_count"][count_key].add(doc)
+            if entry.get("item_count_flexible"):
+                facets["item_count"][FLEXIBLE_COUNT].add(doc)
+
+            fields = {
+                "keyword": entry.get("keywords") or [],
+                "name": [entry.get("name", "")],
+                "use_for": entry.get("use_for") or [],
+                "design_intent": [entry.get("design_intent") or ""],
+            }
+            for field_name, values in fields.items():
+                for value in values:
+                    for token in tokenize(value):
+                        postings[field_name][token][doc] = WEIGHTS[field_name]
+                    phrase = str(value).lower().strip()
+                    if phrase:
+                        # 여러 단어 키워드 전체 일치는 토큰 일치보다 높은 점수
+                        postings[field_name][phrase][doc] = WEIGHTS[field_name] * 2
+
+        return cls(entries,
+                   {f: {t: dict(d) for t, d in tokens.items()} for f, tokens in postings.items()},
+                   {f: {k: frozenset(v) for k, v in values.items()} for f, values in facets.items()},
+                   _fingerprint(_source_files(registry_path, registry)))
+
+    def is_stale(self) -> bool:
+        """
+        의존 파일의 mtime이 바뀌었거나 파일이 삭제되었는지 확인.
+        템플릿 추가·삭제는 registry.yaml mtime 변경으로 감지된다.
+        """
+        return _fingerprint([Path(p) for p in self.fingerprint]) != self.fingerprint
+
+    def save(self, index_path: Path = INDEX_PATH):
+        tmp_path = Path(index_path).with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": INDEX_VERSION, "entries": self.entries,
+                         "postings": self.postings, "facets": self.facets,
+                         "fingerprint": self.fingerprint}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_path.replace(index_path)
+
+    @classmethod
+    def load(cls, index_path: Path = INDEX_PATH, rebuild: bool = True) -> "TemplateIndex":
+        """
+        저장된 인덱스 로드. 없거나 오래되었으면 다시 빌드하여 저장한다.
+        """
+        index = None
+        try:
+            with open(index_path, "rb") as f:
+                data = pickle.load(f)
+            if data.get("version") == INDEX_VERSION:
+                index = cls(data["entries"], data["postings"], data["facets"], data["fingerprint"])
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError):
+            index = None
+
+        if index is None or (rebuild and index.is_stale()):
+            index = cls.build()
+            try:
+                index.save(index_path)
+            except OSError:
+                pass  # 읽기 전용 환경에서는 메모리 인덱스만 사용
+        return index
+
+    # -----------------------------------------------------------------
+    # 조회
+    # -----------------------------------------------------------------
+
+    def candidates(self, category: str = None, item_count: int = None,
+                   information_density: str = None, design_intent: str = None) -> set:
+        """규칙 기반 필터 (역색인 교집합). 조건이 없으면 전체."""
+        result = None
+
+        def narrow(docs):
+            nonlocal result
+            result = set(docs) if result is None else result & docs
+
+        if category:
+            narrow(self.facets["category"].get(category, frozenset()))
+        if item_count is not None:
+            counts = self.facets["item_count"]
+            narrow(counts.get(item_count, frozenset()) | counts.get(FLEXIBLE_COUNT, frozenset()))
+        if information_density:
+            narrow(self.facets["information_density"].get(information_density, frozenset()))
+        if design_intent:
+            narrow(self.facets["design_intent"].get(design_intent, frozenset()))
+        return set(range(len(self.entries))) if result is None else result
+
+    def query(self, text: str = "", keywords=(), category: str = None, item_count: int = None,
+              information_density: str = None, design_intent: str = None,
+              limit: int = 10) -> list:
+        """
+        후보 템플릿을 점수 순으로 반환: [(score, entry), ...]
+
+        필터 조건(category 등)은 후보를 제한하고, text/keywords는 키워드·이름·use_for·
+        design_intent 역색인 점수로 순위를 매긴다. 요소 개수가 정확히 일치하면 가산점,
+        동점은 quality_score로 정렬한다.
+        """
+        allowed = self.candidates(category, item_count, information_density, design_intent)
+        terms = set(tokenize(text))
+        for kw in keywords:
+            terms.update(tokenize(kw))
+            terms.add(str(kw).lower().strip())
+
+        # 필터를 통과한 후보는 모두 0점에서 시작하고, 검색어 적중 가중치를 더해 순위만 바꾼다
+        scores = dict.fromkeys(allowed, 0.0)
+        for field_postings in self.postings.values():
+            for term in terms:
+                for doc, weight in field_postings.get(term, {}).items():
+                    if doc in scores:
+                        scores[doc] += weight
+
+        if item_count is not None:
+            for doc in self.facets["item_count"].get(item_count, ()):
+                if doc in scores:
+                    scores[doc] += 1.0
+
+        ranked = sorted(scores.items(), key=lambda kv: (
+            -kv[1], -(self.entries[kv[0]].get("quality_score") or 0), self.entries[kv[0]]["id"]))
+        return [(score, self.entries[doc]) for doc, score in ranked[:limit]]
+
+    def get(self, template_id: str) -> dict:
+        doc = self.by_id.get(template_id)
+        return None if doc is None else self.entries[doc]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="템플릿 레지스트리 인덱스")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="인덱스 강제 재빌드")
+
+    p_query = sub.add_parser("query", help="후보 템플릿 조회")
+    p_query.add_argument("terms", nargs="*", help="검색어 (키워드, use_for, 이름)")
+    p_query.add_argument("--category", default=None)
+    p_query.add_argument("--count", type=int, default=None, help="필요 요소 개수")
+    p_query.add_argument("--density", default=None, help="information_density (low/medium/high)")
+    p_query.add_argument("--intent", default=None, help="design_intent")
+    p_query.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index = TemplateIndex.build()
+        index.save()
+        print(f"인덱스 빌드 완료: {len(index.entries)}개 템플릿, "
+              f"{(time.perf_counter() - start) * 1000:.0f}ms -> {INDEX_PATH}")
+        return
+
+    index = TemplateIndex.load()
+    start = time.perf_counter()
+    results = index.query(" ".join(args.terms), category=args.category, item_count=args.count,
+                          information_density=args.density, design_intent=args.intent,
+                          limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+    for score, entry in results:
+        print(f"{score:6.1f}  {entry['id']:<28} {entry.get('category', ''):<12} {entry.get('name', '')}")
+    print(f"\n{len(results)}개 후보 ({elapsed:.3f}ms)")
+    if not results:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
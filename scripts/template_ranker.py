@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+TF-IDF 기반 템플릿 시맨틱 사전 순위화
+
+레지스트리 항목의 keywords, use_for, name, design_intent로 TF-IDF 행렬을 만들어
+NumPy .npz로 저장하고, session.yaml 아웃라인의 모든 슬라이드를 한 번의 행렬 곱으로
+전체 템플릿과 비교한다. LLM 시맨틱 매칭 단계에는 상위 k개 후보만 넘긴다.
+
+한국어는 조사·복합어 때문에 단어 단위 일치가 잘 되지 않으므로
+단어 토큰에 더해 한글 음절 bigram을 함께 사용한다. ('조직도를' ~ '조직도')
+
+사용법:
+    python scripts/template_ranker.py build
+    python scripts/template_ranker.py rank <session.yaml> [--top-k K]
+
+예시:
+    python scripts/template_ranker.py rank working/session-20260116-150546/session.yaml --top-k 3
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from template_index import TemplateIndex, TEMPLATES_DIR, tokenize
+
+VECTORS_PATH = TEMPLATES_DIR / "contents" / ".template_vectors.npz"
+DEFAULT_TOP_K = 5
+
+# 필드별 반복 가중치 (TF에 곱해짐)
+FIELD_WEIGHTS = {
+    "keywords": 3.0,
+    "name": 2.0,
+    "design_intent": 1.5,
+    "use_for": 1.0,
+}
+
+_HANGUL_RE = re.compile(r"[가-힣]+")
+
+
+def analyze(text: str) -> list:
+    """단어 토큰 + 한글 음절 bigram"""
+    terms = tokenize(text)
+    for run in _HANGUL_RE.findall(str(text)):
+        terms.extend(f"#{run[i:i + 2]}" for i in range(len(run) - 1))
+    return terms
+
+
+def _template_terms(entry: dict) -> dict:
+    """레지스트리 항목 -> {term: 가중 빈도}"""
+    counts = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        values = entry.get(field) or []
+        if isinstance(values, str):
+            values = [values]
+        for value in values:
+            # design_intent는 'data-visualization-columnar' 형태이므로 구분자를 공백으로
+            for term in analyze(str(value).replace("-", " ")):
+                counts[term] = counts.get(term, 0.0) + weight
+    return counts
+
+
+def slide_text(slide: dict) -> str:
+    """아웃라인 슬라이드에서 매칭용 텍스트 추출 (title, subtitle, purpose, content 문자열)"""
+    parts = [slide.get("title", ""), slide.get("subtitle", ""), slide.get("purpose", "")]
+
+    def collect(value):
+        if isinstance(value, str):
+            parts.append(value)
+        elif isinstance(value, dict):
+            for v in value.values():
+                collect(v)
+        elif isinstance(value, list):
+            for v in value:
+                collect(v)
+
+    collect(slide.get("content", {}))
+    return " ".join(p for p in parts if p)
+
+
+class TemplateRanker:
+    """
+    템플릿 TF-IDF 행렬 (행: 템플릿, 열: 용어, 행 단위 L2 정규화).
+    """
+
+    def __init__(self, ids: list, vocabulary: dict, idf, matrix, fingerprint: dict):
+        self.ids = ids
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.matrix = matrix
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, index: TemplateIndex = None) -> "TemplateRanker":
+        import numpy as np
+
+        index = index or TemplateIndex.load()
+        docs = [_template_terms(entry) for entry in index.entries]
+        vocabulary = {term: i for i, term in enumerate(sorted({t for d in docs for t in d}))}
+
+        tf = np.zeros((len(docs), len(vocabulary)), dtype=np.float32)
+        for row, counts in enumerate(docs):
+            for term, count in counts.items():
+                tf[row, vocabulary[term]] = count
+
+        df = np.count_nonzero(tf, axis=0)
+        idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+        matrix = _l2_normalize(np.log1p(tf) * idf)
+        return cls([e["id"] for e in index.entries], vocabulary, idf, matrix, index.fingerprint)
+
+    def save(self, path: Path = VECTORS_PATH):
+        import numpy as np
+
+        tmp_path = Path(path).with_suffix(".tmp.npz")
+        np.savez_compressed(tmp_path, matrix=self.matrix, idf=self.idf,
+                            meta=np.array(json.dumps({"ids": self.ids, "vocabulary": self.vocabulary,
+                                                      "fingerprint": self.fingerprint},
+                                                     ensure_ascii=False)))
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path = VECTORS_PATH) -> "TemplateRanker":
+        """
+        저장된 행렬 로드. 레지스트리 인덱스가 다시 빌드되었으면(지문 불일치) 행렬도 다시 만든다.
+        """
+        import numpy as np
+
+        index = TemplateIndex.load()
+        try:
+            with np.load(path) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta["fingerprint"] == index.fingerprint:
+                    return cls(meta["ids"], meta["vocabulary"], data["idf"], data["matrix"],
+                               meta["fingerprint"])
+        except (OSError, KeyError, ValueError):
+            pass
+
+        ranker = cls.build(index)
+        try:
+            ranker.save(path)
+        except OSError:
+            pass
+        return ranker
+
+    def vectorize(self, texts: list):
+        """텍스트 목록 -> 질의 행렬 (len(texts) x vocab)"""
+        import numpy as np
+
+        q = np.zeros((len(texts), len(self.vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term in analyze(text):
+                col = self.vocabulary.get(term)
+                if col is not None:
+                    q[row, col] += 1.0
+        return _l2_normalize(np.log1p(q) * self.idf)
+
+    def score(self, texts: list, mask=None):
+        """
+        모든 질의 x 모든 템플릿의 코사인 유사도 (len(texts) x n_templates).
+        mask(bool 배열, 질의별 또는 공통)가 주어지면 규칙 필터를 통과하지 못한 템플릿은 -1.
+        """
+        import numpy as np
+
+        scores = self.vectorize(texts) @ self.matrix.T
+        if mask is not None:
+            scores = np.where(mask, scores, -1.0)
+        return scores
+
+    def top_k(self, texts: list, k: int = DEFAULT_TOP_K, mask=None) -> list:
+        """질의별 상위 k개 [(template_id, score), ...]"""
+        import numpy as np
+
+        scores = self.score(texts, mask)
+        k = min(k, scores.shape[1])
+        if k == 0:
+            return [[] for _ in texts]
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        rows = np.arange(scores.shape[0])[:, None]
+        order = np.argsort(-scores[rows, part], axis=1, kind="stable")
+        best = part[rows, order]
+        return [[(self.ids[c], float(scores[r, c])) for c in best[r] if scores[r, c] > 0]
+                for r in range(scores.shape[0])]
+
+    def shortlist_session(self, session: dict, k: int = DEFAULT_TOP_K) -> dict:
+        """session.yaml 슬라이드 번호 -> 상위 k개 후보"""
+        slides = session.get("slides", [])
+        results = self.top_k([slide_text(s) for s in slides], k)
+        return {s["slide_number"]: r for s, r in zip(slides, results)}
+
+
+def _l2_normalize(m):
+    import numpy as np
+
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return m / norms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TF-IDF 템플릿 사전 순위화")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="템플릿 행렬 강제 재빌드")
+    p_rank = sub.add_parser("rank", help="session.yaml 슬라이드별 상위 k개 후보")
+    p_rank.add_argument("session_yaml")
+    p_rank.add_argument("--top-k", type=int, default=DEFAULT_TOP_K)
+    args = parser.parse_args()
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("오류: numpy가 설치되지 않았습니다.")
+        print("설치 명령: pip install numpy")
+        sys.exit(1)
+
+    if args.command == "build":
+        ranker = TemplateRanker.build()
+        ranker.save()
+        print(f"행렬 빌드 완료: {len(ranker.ids)}개 템플릿 x {len(ranker.vocabulary)}개 용어 -> {VECTORS_PATH}")
+        return
+
+    with open(args.session_yaml, "r", encoding="utf-8") as f:
+        session = yaml.safe_load(f)
+
+    ranker = TemplateRanker.load()
+    start = time.perf_counter()
+    shortlist = ranker.shortlist_session(session, args.top_k)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    for slide in session.get("slides", []):
+        candidates = ", ".join(f"{tid}({score:.2f})" for tid, score in shortlist[slide["slide_number"]])
+        print(f"Slide {slide['slide_number']:>2} {slide.get('title', '')}: {candidates}")
+    print(f"\n{len(shortlist)}개 슬라이드 x {len(ranker.ids)}개 템플릿 ({elapsed:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,20 @@
 """
 모든 슬라이드 재렌더링 스크립트.
 수정된 html_renderer.py를 사용하여 콘텐츠를 올바르게 주입.
+
+단계별 시간 기록: PPTGEN_STAGE_TIMINGS=timings.json python rerender_slides.py
 """
 
 import sys
-import os
-import json
+import argparse
 from pathlib import Path
 
 # Add project root to path
 project_root = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(project_root / ".claude" / "skills" / "ppt-gen" / "scripts"))
+sys.path.insert(0, str(project_root / "scripts"))
 
-import yaml
-from html_renderer import render_template
+from batch_render import BatchRenderer, print_results
+from stage_timer import stage
 
 # Template paths mapping
 TEMPLATE_PATHS = {
@@ -36,59 +37,19 @@ TEMPLATE_PATHS = {
 
 
 def main():
-    session_dir = Path(__file__).parent
-    project_root = session_dir.parent.parent
-
-    # Load session.yaml
-    with open(session_dir / "session.yaml", "r", encoding="utf-8") as f:
-        session = yaml.safe_load(f)
-
-    slides_dir = session_dir / "slides"
-    slides_dir.mkdir(exist_ok=True)
-
-    slides = session.get("slides", [])
-    success_count = 0
-    fail_count = 0
+    parser = argparse.ArgumentParser(description="세션 슬라이드 재렌더링")
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="session.yaml에서 바뀐 슬라이드만 재렌더링")
+    args = parser.parse_args()
 
-    for slide in slides:
-        slide_num = slide["slide_number"]
-        template_id = slide["template"]["id"]
-        content = slide.get("content", {})
-        slide_title = slide.get("title", "untitled")
-
-        # Create filename
-        safe_title = slide_title.lower().replace(" ", "_").replace("/", "_")
-        filename = f"slide_{slide_num:02d}_{safe_title}.html"
-        output_path = slides_dir / filename
-
-        # Get template path
-        if template_id not in TEMPLATE_PATHS:
-            print(f"[SKIP] Slide {slide_num}: Template '{template_id}' not found in mapping")
-            fail_count += 1
-            continue
-
-        template_path = project_root / TEMPLATE_PATHS[template_id]
-        if not template_path.exists():
-            print(f"[SKIP] Slide {slide_num}: Template file not found: {template_path}")
-            fail_count += 1
-            continue
-
-        # Render
-        try:
-            rendered = render_template(
-                str(template_path),
-                content,
-                theme_id="deep-green",
-                themes_dir=str(project_root / "templates" / "themes"),
-                output_path=str(output_path)
-            )
-            print(f"[OK] Slide {slide_num}: {filename}")
-            success_count += 1
-        except Exception as e:
-            print(f"[ERROR] Slide {slide_num}: {e}")
-            fail_count += 1
+    session_dir = Path(__file__).parent
 
-    print(f"\nCompleted: {success_count} success, {fail_count} failed")
+    with stage("rerender"):
+        renderer = BatchRenderer(TEMPLATE_PATHS, theme_id="deep-green", workers=args.workers)
+        report = renderer.render_session(session_dir, incremental=args.incremental)
+    print_results(report)
+    report.print_summary()
 
 
 if __name__ == "__main__":